@@ -0,0 +1,318 @@
+# alt.py
+import os
+import random
+import struct
+import weakref
+import zlib
+from array import array
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dijkstra import astar, shortest_path_tree
+from graph_model import Graph
+from stats import SearchStats
+
+LANDMARKS_MAGIC = b"DJKL"
+LANDMARKS_VERSION = 1
+LANDMARKS_SUFFIX = ".landmarks"
+DEFAULT_LANDMARKS = 8
+ACTIVE_LANDMARKS = 4
+STRATEGIES = ("avoid", "farthest")
+
+_HEADER = struct.Struct("<4sHBIIq")
+
+INF = float("inf")
+
+
+def landmarks_path(graph_path: str) -> str:
+    return graph_path + LANDMARKS_SUFFIX
+
+
+def graph_fingerprint(graph: Graph) -> int:
+    crc = zlib.crc32(struct.pack("<B", 0 if graph.undirected else 1))
+    adj = graph.adj
+    for u in sorted(adj):
+        nbrs = adj[u]
+        vs = sorted(nbrs)
+        crc = zlib.crc32(array("q", [u, len(vs)] + vs).tobytes(), crc)
+        crc = zlib.crc32(array("d", [nbrs[v] for v in vs]).tobytes(), crc)
+    return crc
+
+
+class Landmarks:
+    def __init__(self, vids: array, landmarks: List[int],
+                 forward: List[array], backward: List[array],
+                 undirected: bool, fingerprint: int, graph: Optional[Graph] = None):
+        self.vids = vids
+        self.index: Dict[int, int] = {vid: i for i, vid in enumerate(vids)}
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+        self.undirected = undirected
+        self.fingerprint = fingerprint
+        self.version = -1
+        self._graph = None
+        if graph is not None:
+            self.bind(graph)
+
+    def bind(self, graph: Graph):
+        # Номера версий у каждого графа свои, поэтому версия сверяется только
+        # вместе с самим графом.
+        self.version = graph.version
+        self._graph = weakref.ref(graph)
+
+    def __len__(self) -> int:
+        return len(self.landmarks)
+
+    @property
+    def nbytes(self) -> int:
+        rows = self.forward if self.undirected else self.forward + self.backward
+        return self.vids.itemsize * len(self.vids) + sum(r.itemsize * len(r) for r in rows)
+
+    def matches(self, graph: Graph) -> bool:
+        if (graph.version == self.version and self._graph is not None
+                and self._graph() is graph):
+            return True
+        return (len(graph.vertices) == len(self.vids)
+                and graph.undirected == self.undirected
+                and graph_fingerprint(graph) == self.fingerprint)
+
+    def lower_bound(self, v: int, goal: int) -> float:
+        cv, ct = self.index.get(v), self.index.get(goal)
+        if cv is None or ct is None:
+            return 0.0
+        return self._bound(range(len(self.landmarks)), cv, ct)
+
+    def _bound(self, rows, cv: int, ct: int) -> float:
+        best = 0.0
+        for i in rows:
+            f = self.forward[i]
+            fv, ft = f[cv], f[ct]
+            if fv != INF and ft != INF and ft - fv > best:
+                best = ft - fv
+            b = self.backward[i]
+            bv, bt = b[cv], b[ct]
+            if bv != INF and bt != INF and bv - bt > best:
+                best = bv - bt
+        return best
+
+    def heuristic(self, goal: int, start: Optional[int] = None,
+                  active: int = ACTIVE_LANDMARKS) -> Callable[[int, int], float]:
+        index = self.index
+        ct = index.get(goal)
+        if ct is None:
+            return lambda v, g: 0.0
+
+        rows = list(range(len(self.landmarks)))
+        cs = index.get(start) if start is not None else None
+        if cs is not None and active < len(rows):
+            rows.sort(key=lambda i: self._bound((i,), cs, ct), reverse=True)
+            rows = rows[:active]
+
+        # Для каждого ориентира L: d(v,t) >= d(L,t) - d(L,v) и d(v,t) >= d(v,L) - d(t,L).
+        # Расстояния до цели фиксируются заранее, в цикле остаются только вычитания.
+        terms: List[Tuple[array, float, array, float]] = []
+        for i in rows:
+            f, b = self.forward[i], self.backward[i]
+            terms.append((f, f[ct], b, b[ct]))
+
+        def h(v: int, _goal: int) -> float:
+            cv = index.get(v)
+            if cv is None:
+                return 0.0
+            best = 0.0
+            for f, ft, b, bt in terms:
+                fv = f[cv]
+                if fv != INF and ft != INF and ft - fv > best:
+                    best = ft - fv
+                bv = b[cv]
+                if bv != INF and bt != INF and bv - bt > best:
+                    best = bv - bt
+            return best
+
+        return h
+
+    def query(self, adj: Dict[int, Dict[int, float]], start: int, goal: int,
+              stats: Optional[SearchStats] = None) -> Tuple[float, Optional[List[int]]]:
+        return astar(adj, start, goal, self.heuristic(goal, start), stats)
+
+    def save(self, path: str):
+        k, n = len(self.landmarks), len(self.vids)
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(LANDMARKS_MAGIC, LANDMARKS_VERSION,
+                                 0 if self.undirected else 1, k, n, self.fingerprint))
+            self.vids.tofile(f)
+            array("q", self.landmarks).tofile(f)
+            for row in self.forward:
+                row.tofile(f)
+            if not self.undirected:
+                for row in self.backward:
+                    row.tofile(f)
+
+    @classmethod
+    def load(cls, path: str, graph: Optional[Graph] = None) -> Optional["Landmarks"]:
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) != _HEADER.size:
+                raise ValueError("Файл ориентиров повреждён.")
+            magic, version, directed, k, n, fingerprint = _HEADER.unpack(header)
+            if magic != LANDMARKS_MAGIC or version != LANDMARKS_VERSION:
+                raise ValueError("Неизвестный формат файла ориентиров.")
+            vids = array("q")
+            vids.fromfile(f, n)
+            marks = array("q")
+            marks.fromfile(f, k)
+            forward = []
+            for _ in range(k):
+                row = array("d")
+                row.fromfile(f, n)
+                forward.append(row)
+            backward = forward
+            if directed:
+                backward = []
+                for _ in range(k):
+                    row = array("d")
+                    row.fromfile(f, n)
+                    backward.append(row)
+        result = cls(vids, list(marks), forward, backward, not directed, fingerprint)
+        if graph is not None:
+            if not result.matches(graph):
+                return None
+            result.bind(graph)
+        return result
+
+
+def _distances(adj: Dict[int, Dict[int, float]], source: int,
+               index: Dict[int, int], n: int) -> array:
+    row = array("d", [INF]) * n
+    for v, d in shortest_path_tree(adj, source).dist.items():
+        row[index[v]] = d
+    return row
+
+
+def _farthest(vids: array, rows: List[array], taken: List[int]) -> Optional[int]:
+    # Самая далёкая от всех строк расстояний вершина; недостижимые вершины
+    # (другая компонента) считаются самыми далёкими.
+    best, best_d = None, -1.0
+    skip = set(taken)
+    for i, v in enumerate(vids):
+        if v in skip:
+            continue
+        d = min(row[i] for row in rows)
+        if d > best_d:
+            best, best_d = v, d
+            if d == INF:
+                break
+    return best
+
+
+def _avoid(adj, root: int, index: Dict[int, int], chosen: List[int],
+           forward: List[array], backward: List[array]) -> Optional[int]:
+    # Эвристика avoid: вес вершины — зазор между d(r, v) и текущей нижней оценкой;
+    # спускаемся из r в поддерево с наибольшим суммарным зазором, обходя поддеревья
+    # с уже выбранными ориентирами, и берём лист.
+    tree = shortest_path_tree(adj, root)
+    cr = index[root]
+    children: Dict[int, List[int]] = {}
+    for v, u in tree.prev.items():
+        children.setdefault(u, []).append(v)
+
+    # Обратный порядок обхода в глубину: дети всегда раньше родителя, даже когда
+    # ребро дерева нулевого веса и расстояния у них совпадают.
+    order = []
+    stack = [root]
+    while stack:
+        v = stack.pop()
+        order.append(v)
+        stack.extend(children.get(v, ()))
+    order.reverse()
+
+    marks = set(chosen)
+    size: Dict[int, float] = {}
+    for v in order:
+        if v in marks:
+            size[v] = -1.0
+            continue
+        gap = tree.dist[v]
+        cv = index[v]
+        for f, b in zip(forward, backward):
+            fv, fr = f[cv], f[cr]
+            if fv != INF and fr != INF:
+                gap = min(gap, tree.dist[v] - (fv - fr))
+            bv, br = b[cv], b[cr]
+            if bv != INF and br != INF:
+                gap = min(gap, tree.dist[v] - (br - bv))
+        total = gap
+        for c in children.get(v, ()):
+            if size[c] < 0:
+                total = -1.0
+                break
+            total += size[c]
+        size[v] = total
+
+    v = root
+    while True:
+        best, best_size = None, 0.0
+        for c in children.get(v, ()):
+            if size[c] > best_size:
+                best, best_size = c, size[c]
+        if best is None:
+            break
+        v = best
+    return None if v in marks else v
+
+
+def build_landmarks(graph: Graph, count: int = DEFAULT_LANDMARKS,
+                    strategy: str = "avoid", seed: int = 0) -> Landmarks:
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Неизвестная стратегия выбора ориентиров: {strategy}")
+    adj, radj = graph.adj, graph.radj
+    vids = array("q", graph.vertices.keys())
+    index = {vid: i for i, vid in enumerate(vids)}
+    n = len(vids)
+    rng = random.Random(seed)
+
+    chosen: List[int] = []
+    forward: List[array] = []
+    backward: List[array] = []
+    count = min(count, n)
+    while len(chosen) < count:
+        if not chosen:
+            root = rng.choice(vids)
+            lm = _farthest(vids, [_distances(adj, root, index, n)], [root])
+        elif strategy == "farthest":
+            lm = _farthest(vids, forward, chosen)
+        else:
+            lm = _avoid(adj, rng.choice(vids), index, chosen, forward, backward)
+            if lm is None or lm in chosen:
+                lm = _farthest(vids, forward, chosen)
+        if lm is None or lm in chosen:
+            break
+        chosen.append(lm)
+        row = _distances(adj, lm, index, n)
+        forward.append(row)
+        backward.append(row if graph.undirected else _distances(radj, lm, index, n))
+
+    return Landmarks(vids, chosen, forward, backward, graph.undirected,
+                     graph_fingerprint(graph), graph)
+
+
+def load_or_build(graph: Graph, graph_path: Optional[str] = None,
+                  count: int = DEFAULT_LANDMARKS, strategy: str = "avoid") -> Landmarks:
+    # graph_path — файл, с которым граф сейчас совпадает: построенные ориентиры
+    # записываются рядом с ним. Для графа, изменённого после загрузки и не
+    # сохранённого, передавайте None, иначе файл ориентиров разойдётся с графом.
+    path = landmarks_path(graph_path) if graph_path else None
+    if path and os.path.exists(path):
+        try:
+            landmarks = Landmarks.load(path, graph)
+        except (OSError, ValueError, EOFError):
+            landmarks = None
+        if landmarks is not None:
+            return landmarks
+    landmarks = build_landmarks(graph, count, strategy)
+    if path:
+        try:
+            landmarks.save(path)
+        except OSError:
+            pass
+    return landmarks
@@ -1,12 +1,51 @@
 # app.py
-import json
+import math
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
+from typing import Optional
 
-from graph_model import Graph
-from dijkstra import dijkstra
+from graph_model import ConnectivityIndex, Graph
 from canvas_view import GraphCanvas
-from utils import COLORS
+from heuristics import positional_heuristic, check_geometric_weights
+from graph_io import graph_from_dict, save_json, save_binary, load_binary, is_binary_file
+from importers import import_tk_v1, import_file
+from cache import QueryCache
+from dijkstra import shortest_path, shortest_path_tree
+from alt import load_or_build, landmarks_path
+from dynamic_sssp import DynamicShortestPathTree
+from stats import SearchStats, SearchCancelled
+from utils import COLORS, ALGORITHMS
+
+SEARCH_POLL_MS = 40
+PROGRESS_INTERVAL = 0.05
+
+
+class SearchJob:
+    def __init__(self, graph: Graph, method: str, start: int, goal: int, heuristic=None,
+                 landmarks=None, graph_path=None, full_tree: bool = False, positions=None):
+        self.graph = graph
+        self.version = graph.version
+        # Задание создаётся в потоке Tk — единственном писателе графа.
+        self.snapshot = graph.publish()
+        self.method = method
+        self.start = start
+        self.goal = goal
+        self.heuristic = heuristic
+        self.landmarks = landmarks
+        self.graph_path = graph_path
+        # Полное дерево кратчайших путей строится только по повторному запросу
+        # из того же старта; первый запрос останавливается на финише.
+        self.full_tree = full_tree
+        # Координаты для проверки допустимости A*: проверка обходит все рёбра,
+        # поэтому выполняется в рабочем потоке, а не в Tk.
+        self.positions = positions
+        self.cancelled = threading.Event()
+        # Устаревший индекс связности пересчитывается в рабочем потоке по снимку.
+        self.refresh_connectivity = graph.connectivity.stale
+        self.connectivity: Optional[ConnectivityIndex] = None
 
 
 class App(tk.Tk):
@@ -17,6 +56,15 @@ class App(tk.Tk):
         self.minsize(900, 600)
 
         self.graph = Graph(undirected=True)
+        self.query_cache = QueryCache()
+        self.spt = None
+        self.spt_source = None
+        self.landmarks = None
+        self.graph_path = None
+        self.saved_version = 0
+        self.search_job = None
+        self._search_events = queue.Queue()
+        self._search_poll = None
 
         self.mode = tk.StringVar(value="vertex")
         self.pending_from_vid = None
@@ -30,6 +78,7 @@ class App(tk.Tk):
         file_menu.add_command(label="Новый граф", command=self.on_clear_all)
         file_menu.add_separator()
         file_menu.add_command(label="Открыть…", command=self.on_load)
+        file_menu.add_command(label="Импорт рёбер…", command=self.on_import_edges)
         file_menu.add_command(label="Сохранить как…", command=self.on_save_as)
         menubar.add_cascade(label="Файл", menu=file_menu)
         self.config(menu=menubar)
@@ -55,8 +104,15 @@ class App(tk.Tk):
         ttk.Label(toolbar, text="Финиш:").pack(side=tk.LEFT)
         self.end_cb = ttk.Combobox(toolbar, width=6, textvariable=self.end_var, state="readonly")
         self.end_cb.pack(side=tk.LEFT, padx=4)
+        ttk.Label(toolbar, text="Алгоритм:").pack(side=tk.LEFT, padx=(8, 0))
+        self.algo_var = tk.StringVar(value=next(iter(ALGORITHMS)))
+        self.algo_cb = ttk.Combobox(toolbar, width=16, textvariable=self.algo_var, state="readonly",
+                                    values=list(ALGORITHMS))
+        self.algo_cb.pack(side=tk.LEFT, padx=4)
 
         ttk.Button(toolbar, text="Рассчитать путь", command=self.on_calculate).pack(side=tk.LEFT, padx=8)
+        self.cancel_btn = ttk.Button(toolbar, text="Отмена", command=self.on_cancel_search, state="disabled")
+        self.cancel_btn.pack(side=tk.LEFT, padx=(0, 8))
         ttk.Button(toolbar, text="Сброс подсветки", command=self.on_clear_highlight).pack(side=tk.LEFT)
         ttk.Button(toolbar, text="Удалить всё", command=self.on_clear_all).pack(side=tk.LEFT, padx=(8, 0))
 
@@ -66,6 +122,8 @@ class App(tk.Tk):
         self.result_var = tk.StringVar(value="—")
         self.result_label = ttk.Label(bottom, textvariable=self.result_var, foreground=COLORS["accent"])
         self.result_label.pack(side=tk.LEFT, padx=8)
+        self.stats_var = tk.StringVar(value="")
+        ttk.Label(bottom, textvariable=self.stats_var, foreground=COLORS["edge_text"]).pack(side=tk.RIGHT)
 
         self.canvas_frame = ttk.Frame(self)
         self.canvas_frame.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
@@ -85,10 +143,15 @@ class App(tk.Tk):
 
         self._refresh_vertex_lists()
 
+    def _editor(self):
+        if self.spt is not None and self.spt.graph is self.graph:
+            return self.spt
+        return self.graph
+
     def on_canvas_click(self, x, y):
         if self.mode.get() == "vertex":
             name = self._next_vertex_name()
-            vid = self.graph.add_vertex(name=name)
+            vid = self._editor().add_vertex(name=name)
             self.gcanvas.draw_vertex(vid, name, x, y)
             self._refresh_vertex_lists()
 
@@ -109,24 +172,24 @@ class App(tk.Tk):
                     messagebox.showwarning("Ребро уже есть", "Между этими вершинами ребро уже существует.")
                     self._reset_edge_add()
                     return
-                self.graph.add_edge(self.pending_from_vid, vid, weight)
+                self._editor().add_edge(self.pending_from_vid, vid, weight)
                 self.gcanvas.draw_edge(self.pending_from_vid, vid, weight)
                 self._reset_edge_add()
 
     def _delete_vertex(self, vid: int):
-        removed = self.graph.remove_vertex(vid)
+        removed = self._editor().remove_vertex(vid)
         if not self.graph.vertices:
             self.vertex_name_seq = 0
         self.result_var.set(f"Удалена вершина; удалено рёбер: {len(removed)}")
         self._refresh_vertex_lists()
 
     def _delete_edge(self, u: int, v: int):
-        self.graph.remove_edge(u, v)
+        self._editor().remove_edge(u, v)
         self.result_var.set("Ребро удалено.")
 
     def _update_edge_weight(self, u: int, v: int, w: float):
         try:
-            self.graph.update_edge_weight(u, v, w)
+            self._editor().update_edge_weight(u, v, w)
             self.result_var.set(f"Вес ребра обновлён: {w:g}")
         except ValueError as e:
             messagebox.showerror("Ошибка", str(e))
@@ -148,7 +211,155 @@ class App(tk.Tk):
             messagebox.showerror("Ошибка", "Не удалось найти выбранные вершины.")
             return
 
-        dist, path = dijkstra(self.graph.adj, start_vid, end_vid)
+        method = ALGORITHMS.get(self.algo_var.get(), "dijkstra")
+        heuristic = None
+        positions = None
+        if method == "astar":
+            positions = dict(self.gcanvas.vertex_positions)
+            heuristic = positional_heuristic(positions)
+
+        self.on_cancel_search()
+        if self.graph.connectivity.known_unreachable(start_vid, end_vid):
+            self.stats_var.set("вершины в разных компонентах связности")
+            self._show_path(float("inf"), None)
+            return
+        if method == "dijkstra":
+            if (self.spt is not None and self.spt.graph is self.graph
+                    and self.spt.source == start_vid and not self.spt.stale):
+                self.stats_var.set("из дерева кратчайших путей")
+                self._show_path(*self.spt.query(end_vid))
+                return
+        if heuristic is None:
+            cached = self.query_cache.get(self.graph, (start_vid, end_vid, method))
+            if cached is not None:
+                self.stats_var.set("из кэша")
+                self._show_path(*cached)
+                return
+
+        landmarks = self.landmarks
+        if landmarks is not None and landmarks.version != self.graph.version:
+            landmarks = None
+        full_tree = method == "dijkstra" and self.spt_source == start_vid
+        # Ориентиры читаются и пишутся рядом с файлом, только пока граф с ним совпадает.
+        graph_path = self.graph_path if self.graph.version == self.saved_version else None
+        self.search_job = SearchJob(self.graph, method, start_vid, end_vid, heuristic,
+                                    landmarks, graph_path, full_tree, positions)
+        self.cancel_btn.state(["!disabled"])
+        self.result_var.set("Идёт поиск…")
+        self.stats_var.set("")
+        threading.Thread(target=self._run_search, args=(self.search_job,), daemon=True).start()
+        if self._search_poll is None:
+            self._search_poll = self.after(SEARCH_POLL_MS, self._poll_search)
+
+    def _run_search(self, job: SearchJob):
+        # Выполняется в рабочем потоке: к Tk не обращается, всё передаёт через очередь.
+        last = 0.0
+
+        def hook(event, stats):
+            nonlocal last
+            if job.cancelled.is_set():
+                raise SearchCancelled()
+            if event == "progress":
+                now = time.perf_counter()
+                if now - last >= PROGRESS_INTERVAL:
+                    last = now
+                    self._search_events.put(
+                        ("progress", job, (stats.settled, stats.relaxations, stats.radius), stats))
+
+        stats = SearchStats(hook=hook)
+        try:
+            if job.positions is not None:
+                bad = check_geometric_weights(job.snapshot.adj, job.positions)
+                if bad:
+                    self._search_events.put(("warning", job, len(bad), stats))
+            if job.full_tree:
+                result = shortest_path_tree(job.snapshot.adj, job.start, stats=stats)
+            elif job.method == "alt":
+                # Ориентиры берутся из файла рядом с графом или строятся заново и сохраняются.
+                landmarks = job.landmarks or load_or_build(job.snapshot, job.graph_path)
+                result = (landmarks.query(job.snapshot.adj, job.start, job.goal, stats), landmarks)
+            else:
+                result = shortest_path(job.snapshot, job.start, job.goal, job.method, job.heuristic, stats=stats)
+            if job.refresh_connectivity and not job.cancelled.is_set():
+                index = ConnectivityIndex(job.snapshot)
+                index.rebuild()
+                job.connectivity = index
+        except SearchCancelled:
+            self._search_events.put(("cancelled", job, None, stats))
+        except Exception as e:
+            self._search_events.put(("error", job, e, stats))
+        else:
+            self._search_events.put(("done", job, result, stats))
+
+    def _poll_search(self):
+        self._search_poll = None
+        job = self.search_job
+        if job is not None and (job.graph is not self.graph or job.version != self.graph.version):
+            job.cancelled.set()
+            self._end_search()
+            self.result_var.set("Граф изменён во время поиска — результат отброшен.")
+            self.stats_var.set("")
+        while True:
+            try:
+                kind, event_job, payload, stats = self._search_events.get_nowait()
+            except queue.Empty:
+                break
+            if event_job is not self.search_job:
+                continue
+            if kind == "warning":
+                messagebox.showwarning(
+                    "Эвристика A*",
+                    f"У {payload} рёбер вес меньше расстояния на холсте — "
+                    "A* может найти не кратчайший путь.")
+            elif kind == "progress":
+                settled, relaxations, radius = payload
+                self.stats_var.set(f"поиск… вершин: {settled}, релаксаций: {relaxations}, "
+                                   f"радиус фронта: {radius:.3f}")
+            else:
+                self._end_search()
+                self._finish_search(kind, event_job, payload, stats)
+        if self.search_job is not None:
+            self._search_poll = self.after(SEARCH_POLL_MS, self._poll_search)
+
+    def _finish_search(self, kind: str, job: SearchJob, payload, stats: SearchStats):
+        if kind == "cancelled":
+            self.result_var.set("Поиск отменён.")
+            self.stats_var.set("")
+            return
+        if kind == "error":
+            self.result_var.set("—")
+            messagebox.showerror("Ошибка поиска", str(payload))
+            return
+        if job.connectivity is not None and job.version == self.graph.version:
+            self.graph.connectivity.adopt(job.connectivity)
+        if job.full_tree:
+            self.spt = DynamicShortestPathTree.from_tree(self.graph, job.start, payload.dist, payload.prev)
+            dist, path = self.spt.query(job.goal)
+        else:
+            if job.method == "dijkstra":
+                self.spt_source = job.start
+            if job.method == "alt":
+                # Ориентиры построены по снимку; версия та же, граф — этот.
+                payload, self.landmarks = payload
+                self.landmarks.bind(self.graph)
+            dist, path = payload
+            if job.heuristic is None:
+                self.query_cache.put(self.graph, (job.start, job.goal, job.method), payload)
+        self.stats_var.set(str(stats))
+        self._show_path(dist, path)
+
+    def _end_search(self):
+        self.search_job = None
+        self.cancel_btn.state(["disabled"])
+
+    def on_cancel_search(self):
+        if self.search_job is not None:
+            self.search_job.cancelled.set()
+            self._end_search()
+            self.result_var.set("Поиск отменён.")
+            self.stats_var.set("")
+
+    def _show_path(self, dist, path):
         if path is None:
             self.result_var.set("Пути нет.")
             return
@@ -160,11 +371,14 @@ class App(tk.Tk):
     def on_clear_highlight(self):
         self.gcanvas.clear_highlight()
         self.result_var.set("—")
+        self.stats_var.set("")
 
     def on_clear_all(self):
         if messagebox.askyesno("Очистить всё", "Удалить весь граф?"):
             self.pending_from_vid = None
             self.graph.clear()
+            self.graph_path = None
+            self.landmarks = None
             self.gcanvas.clear_all()
             self.vertex_name_seq = 0
             self._refresh_vertex_lists()
@@ -177,96 +391,99 @@ class App(tk.Tk):
         path = filedialog.asksaveasfilename(
             title="Сохранить граф",
             defaultextension=".json",
-            filetypes=[("Graph JSON", "*.json"), ("All files", "*.*")]
+            filetypes=[("Graph JSON", "*.json"), ("Graph binary", "*.djkb"), ("All files", "*.*")]
         )
         if not path:
             return
 
-        data = {
-            "format": "dijkstra_tk_v1",
-            "undirected": self.graph.undirected,
-            "vertices": [
-                {
-                    "vid": vid,
-                    "name": v.name,
-                    "x": float(self.gcanvas.vertex_positions.get(vid, (0, 0))[0]),
-                    "y": float(self.gcanvas.vertex_positions.get(vid, (0, 0))[1]),
-                }
-                for vid, v in self.graph.vertices.items()
-            ],
-            "edges": self._collect_edges_for_save(),
-        }
-
         try:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            if path.endswith(".djkb"):
+                save_binary(path, self.graph, self.gcanvas.vertex_positions)
+            else:
+                save_json(path, self.graph, self.gcanvas.vertex_positions)
+            self.graph_path = path
+            self.saved_version = self.graph.version
+            if self.landmarks is not None and self.landmarks.version == self.graph.version:
+                self.landmarks.save(landmarks_path(path))
             self.result_var.set(f"Сохранено: {path}")
         except Exception as e:
             messagebox.showerror("Ошибка сохранения", str(e))
 
-    def _collect_edges_for_save(self):
-        edges = []
-        seen = set()
-        for u, nbrs in self.graph.adj.items():
-            for v, w in nbrs.items():
-                key = (min(u, v), max(u, v)) if self.graph.undirected else (u, v)
-                if key in seen:
-                    continue
-                seen.add(key)
-                edges.append({"u": key[0], "v": key[1] if self.graph.undirected else v, "w": w})
-        return edges
-
     def on_load(self):
         path = filedialog.askopenfilename(
             title="Открыть граф",
-            filetypes=[("Graph JSON", "*.json"), ("All files", "*.*")]
+            filetypes=[("Graph JSON", "*.json"), ("Graph binary", "*.djkb"), ("All files", "*.*")]
         )
         if not path:
             return
 
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if is_binary_file(path):
+                graph, positions = load_binary(path)
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    graph, positions = import_tk_v1(f)
         except Exception as e:
             messagebox.showerror("Ошибка загрузки", str(e))
             return
 
+        self._set_graph(graph, positions, path)
+        self.result_var.set(f"Загружено: {path}")
+
+    def on_import_edges(self):
+        path = filedialog.askopenfilename(
+            title="Импорт рёбер",
+            filetypes=[("Edge list", "*.txt *.csv *.tsv"), ("DIMACS", "*.gr"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+
         try:
-            self._load_from_dict(data)
-            self.result_var.set(f"Загружено: {path}")
+            graph, positions = import_file(path)
         except Exception as e:
-            messagebox.showerror("Ошибка формата", str(e))
+            messagebox.showerror("Ошибка импорта", str(e))
+            return
+
+        self._set_graph(graph, positions, path)
+        self.result_var.set(f"Импортировано: {path}; вершин: {len(graph.vertices)}")
 
     def _load_from_dict(self, data: dict):
-        if data.get("format") != "dijkstra_tk_v1":
-            raise ValueError("Неверный или неподдерживаемый формат файла.")
-        undirected = bool(data.get("undirected", True))
+        graph, positions = graph_from_dict(data)
+        self._set_graph(graph, positions)
 
+    def _set_graph(self, graph: Graph, positions, path=None):
         self.pending_from_vid = None
-        self.graph = Graph(undirected=undirected)
+        self.graph = graph
+        self.graph_path = path
+        self.saved_version = graph.version
+        self.spt = None
+        self.spt_source = None
+        self.landmarks = None
         self.gcanvas.clear_all()
+        self.gcanvas.directed = not graph.undirected
+        if not positions and graph.vertices:
+            positions = self._circle_layout(list(graph.vertices))
 
-        id_to_name = {}
-        for item in data.get("vertices", []):
-            vid = int(item["vid"])
-            name = str(item["name"])
-            x = float(item.get("x", 0))
-            y = float(item.get("y", 0))
-            self.graph.add_vertex_explicit(vid, name)
-            self.gcanvas.draw_vertex(vid, name, x, y)
-            id_to_name[vid] = name
+        for vid, v in graph.vertices.items():
+            x, y = positions.get(vid, (0, 0))
+            self.gcanvas.draw_vertex(vid, v.name, x, y)
 
-        for e in data.get("edges", []):
-            u = int(e["u"])
-            v = int(e["v"])
-            w = float(e["w"])
-            if not self.graph.has_edge(u, v):
-                self.graph.add_edge(u, v, w)
-                self.gcanvas.draw_edge(u, v, w)
+        for u, nbrs in graph.adj.items():
+            for v, w in nbrs.items():
+                if not graph.undirected or u <= v:
+                    self.gcanvas.draw_edge(u, v, w)
+        self.gcanvas.fit_to_view()
 
         self._refresh_vertex_lists()
         self.vertex_name_seq = self._next_seq_from_existing_names()
 
+    def _circle_layout(self, vids):
+        cx, cy = 500, 300
+        r = 250
+        n = len(vids)
+        return {vid: (cx + r * math.cos(2 * math.pi * i / n), cy + r * math.sin(2 * math.pi * i / n))
+                for i, vid in enumerate(vids)}
+
     def _ask_weight(self):
         try:
             return simpledialog.askfloat("Вес ребра", "Введите неотрицательный вес:", minvalue=0.0, parent=self)
@@ -0,0 +1,156 @@
+# bench.py
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from generators import GENERATORS
+from graph_model import Graph
+from dijkstra import dijkstra
+from alt import build_landmarks
+from graph_io import save_json, load_json, save_binary, load_binary
+
+SCALES = {"small": 30, "medium": 80, "large": 200}
+
+
+def _timeit(fn: Callable, repeat: int, setup: Optional[Callable[[], object]] = None) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        args = (setup(),) if setup is not None else ()
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _rebuild(graph: Graph) -> Callable[[], Graph]:
+    vertices = [(vid, v.name) for vid, v in graph.vertices.items()]
+    edges = [(u, v, w) for u, nbrs in graph.adj.items() for v, w in nbrs.items()
+             if not graph.undirected or u < v]
+
+    def build() -> Graph:
+        g = Graph(undirected=graph.undirected)
+        for vid, name in vertices:
+            g.add_vertex_explicit(vid, name)
+        for u, v, w in edges:
+            g.add_edge(u, v, w)
+        return g
+
+    return build
+
+
+def run_suite(scale: int, seed: int, queries: int, repeat: int) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory(prefix="dijkstra_bench_") as tmp:
+        for name, make in GENERATORS.items():
+            _run_generator(results, name, make(scale, seed), rng, tmp, queries, repeat)
+    return results
+
+
+def _run_generator(results: Dict[str, float], name: str, generated, rng: random.Random,
+                   tmp: str, queries: int, repeat: int):
+    graph, positions = generated
+    vids = list(graph.vertices)
+    pairs = [(rng.choice(vids), rng.choice(vids)) for _ in range(queries)]
+
+    build = _rebuild(graph)
+    results[f"{name}.build"] = _timeit(build, repeat)
+
+    for queue in (None, "heap4", "auto"):
+        results[f"{name}.query.{queue or 'heapq'}"] = _timeit(
+            lambda: [dijkstra(graph.adj, s, t, queue) for s, t in pairs], repeat)
+
+    results[f"{name}.alt.preprocess"] = _timeit(lambda: build_landmarks(graph), repeat)
+    landmarks = build_landmarks(graph)
+    results[f"{name}.query.alt"] = _timeit(
+        lambda: [landmarks.query(graph.adj, s, t) for s, t in pairs], repeat)
+
+    victims = rng.sample(vids, min(len(vids) // 10, 500))
+
+    def remove(g: Graph):
+        for vid in victims:
+            g.remove_vertex(vid)
+
+    results[f"{name}.remove_vertex"] = _timeit(remove, repeat, setup=build)
+
+    json_path = os.path.join(tmp, f"{name}.json")
+    bin_path = os.path.join(tmp, f"{name}.djkb")
+    results[f"{name}.io.json"] = _timeit(
+        lambda: (save_json(json_path, graph, positions), load_json(json_path)), repeat)
+    results[f"{name}.io.binary"] = _timeit(
+        lambda: (save_binary(bin_path, graph, positions), load_binary(bin_path)), repeat)
+
+
+def compare(baseline: Dict[str, float], current: Dict[str, float],
+            threshold: float) -> List[str]:
+    regressions = []
+    for key in sorted(current):
+        if key not in baseline or baseline[key] <= 0:
+            continue
+        ratio = current[key] / baseline[key]
+        mark = ""
+        if ratio > 1.0 + threshold:
+            mark = "  REGRESSION"
+            regressions.append(key)
+        print(f"{key:40s} {baseline[key] * 1e3:10.2f} ms {current[key] * 1e3:10.2f} ms  x{ratio:5.2f}{mark}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки алгоритма Дейкстры (без Tk).")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_run = sub.add_parser("run", help="запустить бенчмарки")
+    p_run.add_argument("--scale", choices=sorted(SCALES), default="small")
+    p_run.add_argument("--seed", type=int, default=1)
+    p_run.add_argument("--queries", type=int, default=50)
+    p_run.add_argument("--repeat", type=int, default=3)
+    p_run.add_argument("--out", default="bench_results.json")
+    p_run.add_argument("--baseline", help="сравнить с сохранённым результатом")
+    p_run.add_argument("--threshold", type=float, default=0.15)
+
+    p_cmp = sub.add_parser("compare", help="сравнить два файла результатов")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--threshold", type=float, default=0.15)
+
+    args = parser.parse_args(argv)
+
+    if args.cmd == "run":
+        results = run_suite(SCALES[args.scale], args.seed, args.queries, args.repeat)
+        data = {
+            "meta": {
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "scale": args.scale,
+                "seed": args.seed,
+                "queries": args.queries,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": results,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        for key, value in results.items():
+            print(f"{key:40s} {value * 1e3:10.2f} ms")
+        if args.baseline:
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                baseline = json.load(f)["results"]
+            return 1 if compare(baseline, results, args.threshold) else 0
+        return 0
+
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    with open(args.current, "r", encoding="utf-8") as f:
+        current = json.load(f)["results"]
+    return 1 if compare(baseline, current, args.threshold) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+# cache.py
+import sys
+import weakref
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Tuple
+
+from dijkstra import shortest_path
+from stats import SearchStats
+
+Result = Tuple[float, Optional[List[int]]]
+
+
+def _result_size(result: Result) -> int:
+    _, path = result
+    size = sys.getsizeof(result) + 24
+    if path is not None:
+        size += sys.getsizeof(path) + 28 * len(path)
+    return size
+
+
+class QueryCache:
+    def __init__(self, maxsize: int = 1024, max_bytes: int = 16 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, Tuple[Result, int]]" = OrderedDict()
+        self._bytes = 0
+        self._graph_ref: Optional[weakref.ref] = None
+        self._version = -1
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def clear(self):
+        self._data.clear()
+        self._bytes = 0
+
+    def _sync(self, graph):
+        if self._graph_ref is None or self._graph_ref() is not graph or self._version != graph.version:
+            self.clear()
+            self._graph_ref = weakref.ref(graph)
+            self._version = graph.version
+
+    def get(self, graph, key: Hashable) -> Optional[Result]:
+        self._sync(graph)
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, graph, key: Hashable, result: Result):
+        self._sync(graph)
+        size = _result_size(result)
+        if size > self.max_bytes:
+            return
+        old = self._data.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._data[key] = (result, size)
+        self._bytes += size
+        while self._data and (len(self._data) > self.maxsize or self._bytes > self.max_bytes):
+            _, (_, evicted) = self._data.popitem(last=False)
+            self._bytes -= evicted
+
+    def shortest_path(self, graph, start: int, goal: int,
+                      method: str = "dijkstra",
+                      heuristic: Optional[Callable[[int, int], float]] = None,
+                      stats: Optional[SearchStats] = None) -> Result:
+        if heuristic is not None:
+            return shortest_path(graph, start, goal, method, heuristic, stats=stats)
+        key = (start, goal, method)
+        result = self.get(graph, key)
+        if result is None:
+            result = shortest_path(graph, start, goal, method, stats=stats)
+            self.put(graph, key, result)
+        return result
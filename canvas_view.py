@@ -1,10 +1,70 @@
+import math
 import tkinter as tk
 from tkinter import ttk, simpledialog, messagebox
-from typing import Callable, Dict, Tuple, Optional, List
+from typing import Callable, Dict, Tuple, Optional, List, Set
 from utils import COLORS
 
 RADIUS = 18
 
+GRID_CELL = 128.0
+VIEW_MARGIN = 40
+MIN_SCALE, MAX_SCALE = 0.005, 8.0
+ZOOM_STEP = 1.2
+LABEL_MIN_SCALE = 0.6
+DETAIL_MAX_VERTICES = 1500
+CLUSTER_PX = 24
+
+
+class SpatialGrid:
+    def __init__(self, cell: float = GRID_CELL):
+        self.cell = cell
+        self.cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._where: Dict[int, Tuple[int, int]] = {}
+
+    def _key(self, x: float, y: float) -> Tuple[int, int]:
+        return int(math.floor(x / self.cell)), int(math.floor(y / self.cell))
+
+    def add(self, vid: int, x: float, y: float):
+        key = self._key(x, y)
+        old = self._where.get(vid)
+        if old == key:
+            return
+        if old is not None:
+            self._discard(vid, old)
+        self.cells.setdefault(key, set()).add(vid)
+        self._where[vid] = key
+
+    def remove(self, vid: int):
+        key = self._where.pop(vid, None)
+        if key is not None:
+            self._discard(vid, key)
+
+    def _discard(self, vid: int, key: Tuple[int, int]):
+        bucket = self.cells[key]
+        bucket.discard(vid)
+        if not bucket:
+            del self.cells[key]
+
+    def clear(self):
+        self.cells.clear()
+        self._where.clear()
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> Set[int]:
+        cx0, cy0 = self._key(x0, y0)
+        cx1, cy1 = self._key(x1, y1)
+        found: Set[int] = set()
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(self.cells):
+            for (cx, cy), bucket in self.cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    found |= bucket
+        else:
+            for cx in range(cx0, cx1 + 1):
+                for cy in range(cy0, cy1 + 1):
+                    bucket = self.cells.get((cx, cy))
+                    if bucket:
+                        found |= bucket
+        return found
+
 
 class GraphCanvas(ttk.Frame):
     def __init__(self, master,
@@ -28,13 +88,36 @@ class GraphCanvas(ttk.Frame):
         self.canvas = tk.Canvas(self, bg=COLORS["canvas_bg"], highlightthickness=0)
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
-        self.vertex_items: Dict[int, Tuple[int, int]] = {}
+        # Модель сцены в мировых координатах; элементы холста создаются
+        # только для того, что попадает в видимую область.
+        self.vertex_names: Dict[int, str] = {}
         self.vertex_positions: Dict[int, Tuple[float, float]] = {}
+        self.edges: Dict[Tuple[int, int], float] = {}
+        self.incident: Dict[int, Set[int]] = {}
+        self.grid = SpatialGrid()
+
+        self.vertex_items: Dict[int, Tuple[int, int]] = {}
         self.edge_items: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        # В ориентированном графе (u, v) и (v, u) — разные дуги со своими элементами.
+        self.directed = False
         self.selected_vid: Optional[int] = None
 
+        self.scale = 1.0
+        self.offset: Tuple[float, float] = (0.0, 0.0)
+        self._labels_shown = True
+        self._aggregated = False
+
+        self._highlighted_vertices: Set[int] = set()
+        self._highlighted_edges: Set[Tuple[int, int]] = set()
+        self._highlighted_path: List[int] = []
+        self._dirty: Set[int] = set()
+        self._view_dirty = False
+        self._redraw_job: Optional[str] = None
+        self._create_z_markers()
+
         self.dragging_vid: Optional[int] = None
         self.drag_offset: Tuple[float, float] = (0, 0)
+        self._pan_from: Optional[Tuple[int, int]] = None
 
         self.vertex_menu = tk.Menu(self, tearoff=0)
         self.vertex_menu.add_command(label="Удалить вершину", command=self._cm_delete_vertex)
@@ -51,99 +134,366 @@ class GraphCanvas(ttk.Frame):
         self.canvas.bind("<ButtonRelease-1>", self._on_lmb_up)
         self.canvas.bind("<Button-3>", self._on_rmb)
         self.canvas.bind("<Double-Button-1>", self._on_double_lmb)
+        self.canvas.bind("<ButtonPress-2>", self._on_pan_start)
+        self.canvas.bind("<B2-Motion>", self._on_pan_move)
+        self.canvas.bind("<ButtonRelease-2>", self._on_pan_end)
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.zoom_at(e.x, e.y, ZOOM_STEP))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom_at(e.x, e.y, 1 / ZOOM_STEP))
+        self.canvas.bind("<Configure>", lambda e: self._schedule_redraw())
+
+    def to_screen(self, x: float, y: float) -> Tuple[float, float]:
+        return x * self.scale + self.offset[0], y * self.scale + self.offset[1]
+
+    def to_world(self, sx: float, sy: float) -> Tuple[float, float]:
+        return (sx - self.offset[0]) / self.scale, (sy - self.offset[1]) / self.scale
 
     def draw_vertex(self, vid: int, name: str, x: float, y: float):
-        circle = self.canvas.create_oval(x - RADIUS, y - RADIUS, x + RADIUS, y + RADIUS,
-                                         fill=COLORS["node_fill"], outline=COLORS["node_border"],
-                                         width=2, tags=(f"vertex", f"v{vid}"))
-        text = self.canvas.create_text(x, y, text=name, font=("Segoe UI", 10, "bold"),
-                                       fill=COLORS["node_text"],
-                                       tags=(f"vertex_label", f"v{vid}"))
-        self.vertex_items[vid] = (circle, text)
+        self.vertex_names[vid] = name
         self.vertex_positions[vid] = (x, y)
-
-        self.canvas.tag_lower("edge")
-        self.canvas.tag_raise("vertex")
-        self.canvas.tag_raise("vertex_label")
+        self.grid.add(vid, x, y)
+        self._schedule_redraw()
 
     def draw_edge(self, u: int, v: int, w: float):
-        x1, y1 = self.vertex_positions[u]
-        x2, y2 = self.vertex_positions[v]
-        line = self.canvas.create_line(x1, y1, x2, y2, width=2,
-                                       fill=COLORS["edge"],
-                                       tags=(f"edge", f"e{u}-{v}", f"e{v}-{u}"))
-        mx, my = (x1 + x2) / 2, (y1 + y2) / 2
-        label = self.canvas.create_text(mx, my - 10, text=f"{w:g}",
-                                        font=("Segoe UI", 9),
-                                        fill=COLORS["edge_text"],
-                                        tags=("edge_label", f"e{u}-{v}", f"e{v}-{u}"))
-        self.edge_items[(u, v)] = (line, label)
-        self.edge_items[(v, u)] = (line, label)
+        if not self.directed and (v, u) in self.edges:
+            self._remove_edge_visual(v, u)
+        self.edges[(u, v)] = w
+        self.incident.setdefault(u, set()).add(v)
+        self.incident.setdefault(v, set()).add(u)
+        if (u, v) in self.edge_items:
+            _, label = self.edge_items[(u, v)]
+            self.canvas.itemconfig(label, text=f"{w:g}")
+        self._schedule_redraw()
+
+    def _edge_key(self, u: int, v: int) -> Optional[Tuple[int, int]]:
+        if (u, v) in self.edges:
+            return (u, v)
+        if not self.directed and (v, u) in self.edges:
+            return (v, u)
+        return None
 
-        self.canvas.tag_lower("edge")
-        self.canvas.tag_raise("vertex")
-        self.canvas.tag_raise("vertex_label")
+    def _edge_keys(self, u: int, v: int) -> List[Tuple[int, int]]:
+        if not self.directed:
+            key = self._edge_key(u, v)
+            return [key] if key is not None else []
+        return [key for key in ((u, v), (v, u)) if key in self.edges]
+
+    def _path_key(self, u: int, v: int) -> Tuple[int, int]:
+        return (u, v) if self.directed or u <= v else (v, u)
+
+    def _create_z_markers(self):
+        # Невидимые маркеры делят список отображения на слои: рёбра ниже
+        # _z_edge_labels, подписи рёбер между ним и _z_vertices, вершины между
+        # _z_vertices и _z_labels, подписи вершин выше. Новые элементы ставятся
+        # на место одним tag_lower.
+        self._z_edge_labels = self.canvas.create_line(0, 0, 0, 0, state=tk.HIDDEN, tags=("z_marker",))
+        self._z_vertices = self.canvas.create_line(0, 0, 0, 0, state=tk.HIDDEN, tags=("z_marker",))
+        self._z_labels = self.canvas.create_line(0, 0, 0, 0, state=tk.HIDDEN, tags=("z_marker",))
+
+    def fit_to_view(self):
+        if not self.vertex_positions:
+            return
+        xs = [p[0] for p in self.vertex_positions.values()]
+        ys = [p[1] for p in self.vertex_positions.values()]
+        x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+        w = max(self.canvas.winfo_width(), self.canvas.winfo_reqwidth(), 1)
+        h = max(self.canvas.winfo_height(), self.canvas.winfo_reqheight(), 1)
+        if x0 - RADIUS >= 0 and y0 - RADIUS >= 0 and x1 + RADIUS <= w and y1 + RADIUS <= h:
+            self.scale, self.offset = 1.0, (0.0, 0.0)
+        else:
+            pad = 2 * RADIUS
+            self.scale = min((w - 2 * pad) / max(x1 - x0, 1e-9), (h - 2 * pad) / max(y1 - y0, 1e-9), 1.0)
+            self.scale = max(MIN_SCALE, self.scale)
+            self.offset = ((w - (x0 + x1) * self.scale) / 2, (h - (y0 + y1) * self.scale) / 2)
+        self._schedule_redraw()
+
+    def zoom_at(self, sx: float, sy: float, factor: float):
+        scale = min(MAX_SCALE, max(MIN_SCALE, self.scale * factor))
+        if scale == self.scale:
+            return
+        wx, wy = self.to_world(sx, sy)
+        self.scale = scale
+        self.offset = (sx - wx * scale, sy - wy * scale)
+        self._schedule_redraw()
+
+    def pan(self, dx: float, dy: float):
+        self.offset = (self.offset[0] + dx, self.offset[1] + dy)
+        self.canvas.move("all", dx, dy)
+        self._schedule_redraw()
 
     def move_vertex_to(self, vid: int, x: float, y: float):
-        circle, text = self.vertex_items[vid]
-        x0, y0 = self.vertex_positions[vid]
-        dx, dy = x - x0, y - y0
-        self.canvas.move(circle, dx, dy)
-        self.canvas.move(text, dx, dy)
         self.vertex_positions[vid] = (x, y)
-        self._redraw_incident_edges(vid)
-
-        self.canvas.tag_lower("edge")
-        self.canvas.tag_raise("vertex")
-        self.canvas.tag_raise("vertex_label")
+        self.grid.add(vid, x, y)
+        self._dirty.add(vid)
+        self._schedule_redraw(view=False)
+
+    def _schedule_redraw(self, view: bool = True):
+        if view:
+            self._view_dirty = True
+        if self._redraw_job is None:
+            self._redraw_job = self.after_idle(self._flush_redraw)
+
+    def _flush_redraw(self):
+        self._redraw_job = None
+        dirty, self._dirty = self._dirty, set()
+        if self._view_dirty or self._aggregated:
+            self._view_dirty = False
+            self._refresh_view()
+            return
+        for vid in dirty:
+            if vid in self.vertex_items:
+                self._place_vertex(vid)
+                for v in self.incident.get(vid, ()):
+                    for key in self._edge_keys(vid, v):
+                        if key in self.edge_items:
+                            self._place_edge(*key)
+
+    def _visible_vertices(self) -> Set[int]:
+        w = max(self.canvas.winfo_width(), 1)
+        h = max(self.canvas.winfo_height(), 1)
+        x0, y0 = self.to_world(-VIEW_MARGIN, -VIEW_MARGIN)
+        x1, y1 = self.to_world(w + VIEW_MARGIN, h + VIEW_MARGIN)
+        return self.grid.query(x0, y0, x1, y1)
+
+    def _refresh_view(self):
+        visible = self._visible_vertices()
+        aggregated = len(visible) > DETAIL_MAX_VERTICES
+        self.canvas.delete("cluster")
+        self.canvas.delete("overlay")
+        if aggregated:
+            for vid in list(self.vertex_items):
+                self._dematerialize_vertex(vid)
+            self._aggregated = True
+            self._draw_clusters(visible)
+            return
+        self._aggregated = False
+
+        labels = self.scale >= LABEL_MIN_SCALE
+        if labels != self._labels_shown:
+            self._labels_shown = labels
+            state = tk.NORMAL if labels else tk.HIDDEN
+            self.canvas.itemconfig("vertex_label", state=state)
+            self.canvas.itemconfig("edge_label", state=state)
+
+        for vid in [vid for vid in self.vertex_items if vid not in visible]:
+            self._dematerialize_vertex(vid)
+        for vid in visible:
+            if vid in self.vertex_items:
+                self._place_vertex(vid)
+            else:
+                self._materialize_vertex(vid)
+
+        wanted = set()
+        for u in visible:
+            for v in self.incident.get(u, ()):
+                wanted.update(self._edge_keys(u, v))
+        # Перебираются только созданные элементы, а не все рёбра графа.
+        stale = [key for key in self.edge_items
+                 if key not in wanted and (self.directed or (key[1], key[0]) not in wanted)]
+        for key in stale:
+            if key in self.edge_items:
+                self._dematerialize_edge(*key)
+        for u, v in wanted:
+            if (u, v) in self.edge_items:
+                self._place_edge(u, v)
+            else:
+                self._materialize_edge(u, v)
+
+    def _vertex_radius(self) -> float:
+        return max(3.0, RADIUS * min(self.scale, 1.5))
+
+    def _materialize_vertex(self, vid: int):
+        x, y = self.to_screen(*self.vertex_positions[vid])
+        r = self._vertex_radius()
+        fill, outline, width = self._vertex_style(vid)
+        circle = self.canvas.create_oval(x - r, y - r, x + r, y + r,
+                                         fill=fill, outline=outline,
+                                         width=width, tags=(f"vertex", f"v{vid}"))
+        text = self.canvas.create_text(x, y, text=self.vertex_names.get(vid, ""),
+                                       font=("Segoe UI", 10, "bold"),
+                                       fill=COLORS["node_text"],
+                                       state=tk.NORMAL if self._labels_shown else tk.HIDDEN,
+                                       tags=(f"vertex_label", f"v{vid}"))
+        self.canvas.tag_lower(circle, self._z_labels)
+        self.vertex_items[vid] = (circle, text)
 
-    def _redraw_incident_edges(self, vid: int):
-        for (u, v), (line, label) in list(self.edge_items.items()):
-            if u == vid or v == vid:
-                x1, y1 = self.vertex_positions[u]
-                x2, y2 = self.vertex_positions[v]
-                self.canvas.coords(line, x1, y1, x2, y2)
-                mx, my = (x1 + x2) / 2, (y1 + y2) / 2
-                self.canvas.coords(label, mx, my - 10)
+    def _place_vertex(self, vid: int):
+        circle, text = self.vertex_items[vid]
+        x, y = self.to_screen(*self.vertex_positions[vid])
+        r = self._vertex_radius()
+        self.canvas.coords(circle, x - r, y - r, x + r, y + r)
+        self.canvas.coords(text, x, y)
+
+    def _dematerialize_vertex(self, vid: int):
+        circle, text = self.vertex_items.pop(vid)
+        self.canvas.delete(circle)
+        self.canvas.delete(text)
+        for v in self.incident.get(vid, ()):
+            for key in self._edge_keys(vid, v):
+                if key in self.edge_items:
+                    self._dematerialize_edge(*key)
+
+    def _edge_coords(self, u: int, v: int) -> Tuple[Tuple[float, ...], Tuple[float, float]]:
+        x1, y1 = self.to_screen(*self.vertex_positions[u])
+        x2, y2 = self.to_screen(*self.vertex_positions[v])
+        mx, my = (x1 + x2) / 2, (y1 + y2) / 2
+        if not self.directed or (v, u) not in self.edges:
+            return (x1, y1, x2, y2), (mx, my - 10)
+        # Встречные дуги расходятся в разные стороны, у каждой своя подпись.
+        length = math.hypot(x2 - x1, y2 - y1) or 1.0
+        nx, ny = (y2 - y1) / length, (x1 - x2) / length
+        return (x1 + 3 * nx, y1 + 3 * ny, x2 + 3 * nx, y2 + 3 * ny), (mx + 12 * nx, my + 12 * ny)
+
+    def _materialize_edge(self, u: int, v: int):
+        coords, (lx, ly) = self._edge_coords(u, v)
+        active = self._path_key(u, v) in self._highlighted_edges
+        tags = (f"e{u}-{v}",) if self.directed else (f"e{u}-{v}", f"e{v}-{u}")
+        line = self.canvas.create_line(*coords, width=4 if active else 2,
+                                       fill=COLORS["accent"] if active else COLORS["edge"],
+                                       tags=("edge",) + tags)
+        label = self.canvas.create_text(lx, ly, text=f"{self.edges[(u, v)]:g}",
+                                        font=("Segoe UI", 9),
+                                        fill=COLORS["edge_text"],
+                                        state=tk.NORMAL if self._labels_shown else tk.HIDDEN,
+                                        tags=("edge_label",) + tags)
+        self.canvas.tag_lower(line, self._z_edge_labels)
+        self.canvas.tag_lower(label, self._z_vertices)
+        self.edge_items[(u, v)] = (line, label)
+        if not self.directed:
+            self.edge_items[(v, u)] = (line, label)
+
+    def _place_edge(self, u: int, v: int):
+        line, label = self.edge_items[(u, v)]
+        coords, (lx, ly) = self._edge_coords(u, v)
+        self.canvas.coords(line, *coords)
+        self.canvas.coords(label, lx, ly)
+
+    def _dematerialize_edge(self, u: int, v: int):
+        line, label = self.edge_items.pop((u, v))
+        if not self.directed:
+            self.edge_items.pop((v, u), None)
+        self.canvas.delete(line)
+        self.canvas.delete(label)
+
+    def _draw_clusters(self, visible: Set[int]):
+        # При мелком масштабе вершины сводятся в кластеры по экранной сетке,
+        # а рёбра между кластерами — в одну линию на пару кластеров.
+        cell = CLUSTER_PX / self.scale
+        pos = self.vertex_positions
+        members: Dict[Tuple[int, int], List[int]] = {}
+        for vid in visible:
+            x, y = pos[vid]
+            members.setdefault((int(x // cell), int(y // cell)), []).append(vid)
+
+        centers: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        for key, vids in members.items():
+            centers[key] = (sum(pos[v][0] for v in vids) / len(vids),
+                            sum(pos[v][1] for v in vids) / len(vids))
+
+        links: Dict[Tuple[Tuple[int, int], Tuple[int, int]], int] = {}
+        for key, vids in members.items():
+            for u in vids:
+                for v in self.incident.get(u, ()):
+                    x, y = pos[v]
+                    other = (int(x // cell), int(y // cell))
+                    if other != key and (other not in members or key < other):
+                        pair = (key, other)
+                        links[pair] = links.get(pair, 0) + 1
+
+        for (a, b), count in links.items():
+            ax, ay = self.to_screen(*centers[a])
+            bx, by = self.to_screen(*centers.get(b, ((b[0] + 0.5) * cell, (b[1] + 0.5) * cell)))
+            self.canvas.create_line(ax, ay, bx, by, fill=COLORS["edge"],
+                                    width=min(6.0, 1.0 + math.log2(count)), tags=("cluster",))
+        for key, vids in members.items():
+            x, y = self.to_screen(*centers[key])
+            r = min(CLUSTER_PX / 2, 2.0 + math.log2(len(vids)))
+            self.canvas.create_oval(x - r, y - r, x + r, y + r, fill=COLORS["node_fill"],
+                                    outline=COLORS["node_border"], tags=("cluster",))
+
+        path = [vid for vid in self._highlighted_path if vid in pos]
+        if len(path) > 1:
+            coords = []
+            for vid in path:
+                coords.extend(self.to_screen(*pos[vid]))
+            self.canvas.create_line(*coords, width=3, fill=COLORS["accent"], tags=("overlay",))
 
     def highlight_path(self, path: List[int]):
-        self.clear_highlight()
-        for vid in path:
-            circle, _ = self.vertex_items[vid]
-            self.canvas.itemconfig(circle, fill=COLORS["node_fill_active"], outline=COLORS["accent"], width=3)
-        for i in range(len(path) - 1):
-            u, v = path[i], path[i + 1]
-            if (u, v) in self.edge_items:
-                line, _ = self.edge_items[(u, v)]
-                self.canvas.itemconfig(line, width=4, fill=COLORS["accent"])
-
-        self.canvas.tag_lower("edge")
-        self.canvas.tag_raise("vertex")
-        self.canvas.tag_raise("vertex_label")
+        vertices = {vid for vid in path if vid in self.vertex_positions}
+        edges = {self._path_key(u, v)
+                 for u, v in zip(path, path[1:]) if self._edge_key(u, v) is not None}
+
+        old_vertices, old_edges = self._highlighted_vertices, self._highlighted_edges
+        self._highlighted_vertices = vertices
+        self._highlighted_edges = edges
+        self._highlighted_path = list(path)
+        for vid in old_vertices ^ vertices:
+            self._restyle_vertex(vid)
+        for uv in old_edges - edges:
+            self._set_edge_style(uv, False)
+        for uv in edges - old_edges:
+            self._set_edge_style(uv, True)
+        if self._aggregated:
+            self._schedule_redraw()
 
     def clear_highlight(self):
-        for vid, (circle, _) in self.vertex_items.items():
-            self.canvas.itemconfig(circle, fill=COLORS["node_fill"], outline=COLORS["node_border"], width=2)
-        for (u, v), (line, _) in self.edge_items.items():
+        self.highlight_path([])
+
+    def _vertex_style(self, vid: int) -> Tuple[str, str, int]:
+        if vid == self.selected_vid:
+            fill = COLORS["node_fill_active"] if vid in self._highlighted_vertices else COLORS["node_fill"]
+            return fill, COLORS["select"], 3
+        if vid in self._highlighted_vertices:
+            return COLORS["node_fill_active"], COLORS["accent"], 3
+        return COLORS["node_fill"], COLORS["node_border"], 2
+
+    def _restyle_vertex(self, vid: int):
+        if vid not in self.vertex_items:
+            return
+        circle, _ = self.vertex_items[vid]
+        fill, outline, width = self._vertex_style(vid)
+        self.canvas.itemconfig(circle, fill=fill, outline=outline, width=width)
+
+    def _set_edge_style(self, uv: Tuple[int, int], active: bool):
+        if uv not in self.edge_items:
+            return
+        line, _ = self.edge_items[uv]
+        if active:
+            self.canvas.itemconfig(line, width=4, fill=COLORS["accent"])
+        else:
             self.canvas.itemconfig(line, width=2, fill=COLORS["edge"])
 
     def indicate_vertex_selected(self, vid: int):
         self.selected_vid = vid
-        circle, _ = self.vertex_items[vid]
-        self.canvas.itemconfig(circle, outline=COLORS["select"], width=3)
+        self._restyle_vertex(vid)
 
     def indicate_vertex_unselected(self, vid: int):
         if self.selected_vid == vid:
             self.selected_vid = None
-        circle, _ = self.vertex_items[vid]
-        self.canvas.itemconfig(circle, outline=COLORS["node_border"], width=2)
+        self._restyle_vertex(vid)
 
     def clear_all(self):
+        if self._redraw_job is not None:
+            self.after_cancel(self._redraw_job)
+            self._redraw_job = None
+        self._dirty.clear()
+        self._view_dirty = False
         self.canvas.delete("all")
-        self.vertex_items.clear()
+        self.vertex_names.clear()
         self.vertex_positions.clear()
+        self.edges.clear()
+        self.incident.clear()
+        self.grid.clear()
+        self.vertex_items.clear()
         self.edge_items.clear()
+        self._highlighted_vertices.clear()
+        self._highlighted_edges.clear()
+        self._highlighted_path = []
         self.selected_vid = None
+        self.scale, self.offset = 1.0, (0.0, 0.0)
+        self._labels_shown = True
+        self._aggregated = False
+        self._create_z_markers()
 
     def set_mode(self, mode: str):
         pass
@@ -151,26 +501,50 @@ class GraphCanvas(ttk.Frame):
     def _on_lmb_down(self, e):
         mode = self.mode_provider()
         item = self._item_under_cursor(e.x, e.y)
-        if item and "vertex" in self.canvas.gettags(item):
-            vid = self._vid_from_tags(self.canvas.gettags(item))
+        tags = self.canvas.gettags(item) if item else ()
+        if "cluster" in tags:
+            self.zoom_at(e.x, e.y, 2.0)
+        elif "vertex" in tags:
+            vid = self._vid_from_tags(tags)
             if mode == "move":
                 self.dragging_vid = vid
                 x, y = self.vertex_positions[vid]
-                self.drag_offset = (e.x - x, e.y - y)
+                wx, wy = self.to_world(e.x, e.y)
+                self.drag_offset = (wx - x, wy - y)
             else:
                 self.on_vertex_clicked(vid)
         else:
             if mode == "vertex":
-                self.on_canvas_click(e.x, e.y)
+                self.on_canvas_click(*self.to_world(e.x, e.y))
+            elif mode == "move":
+                self._pan_from = (e.x, e.y)
 
     def _on_mouse_move(self, e):
         if self.dragging_vid is not None and self.mode_provider() == "move":
-            vx = e.x - self.drag_offset[0]
-            vy = e.y - self.drag_offset[1]
-            self.move_vertex_to(self.dragging_vid, vx, vy)
+            wx, wy = self.to_world(e.x, e.y)
+            self.move_vertex_to(self.dragging_vid, wx - self.drag_offset[0], wy - self.drag_offset[1])
+        elif self._pan_from is not None:
+            self._on_pan_move(e)
 
     def _on_lmb_up(self, e):
         self.dragging_vid = None
+        self._pan_from = None
+
+    def _on_pan_start(self, e):
+        self._pan_from = (e.x, e.y)
+
+    def _on_pan_move(self, e):
+        if self._pan_from is None:
+            return
+        dx, dy = e.x - self._pan_from[0], e.y - self._pan_from[1]
+        self._pan_from = (e.x, e.y)
+        self.pan(dx, dy)
+
+    def _on_pan_end(self, e):
+        self._pan_from = None
+
+    def _on_wheel(self, e):
+        self.zoom_at(e.x, e.y, ZOOM_STEP if e.delta > 0 else 1 / ZOOM_STEP)
 
     def _on_rmb(self, e):
         item = self._item_under_cursor(e.x, e.y)
@@ -208,7 +582,7 @@ class GraphCanvas(ttk.Frame):
             if new_w is None:
                 return
             self.on_request_update_weight(u, v, new_w)
-            self._update_edge_label(u, v, f"{new_w:g}")
+            self._update_edge_weight(u, v, new_w)
 
     def _cm_delete_vertex(self):
         if self._cm_vertex_vid is None:
@@ -227,7 +601,7 @@ class GraphCanvas(ttk.Frame):
         if new_w is None:
             return
         self.on_request_update_weight(u, v, new_w)
-        self._update_edge_label(u, v, f"{new_w:g}")
+        self._update_edge_weight(u, v, new_w)
 
     def _cm_delete_edge(self):
         if not self._cm_edge_uv:
@@ -238,26 +612,43 @@ class GraphCanvas(ttk.Frame):
         self._remove_edge_visual(u, v)
 
     def _remove_vertex_visual(self, vid: int):
-        for (u, v) in list(self.edge_items.keys()):
-            if u == vid or v == vid:
-                self._remove_edge_visual(u, v)
+        for v in list(self.incident.get(vid, ())):
+            self._remove_edge_visual(vid, v)
+        self.incident.pop(vid, None)
         if vid in self.vertex_items:
-            circle, text = self.vertex_items.pop(vid)
-            self.canvas.delete(circle)
-            self.canvas.delete(text)
+            self._dematerialize_vertex(vid)
         self.vertex_positions.pop(vid, None)
+        self.vertex_names.pop(vid, None)
+        self.grid.remove(vid)
+        self._highlighted_vertices.discard(vid)
+        self._dirty.discard(vid)
+        if self._aggregated:
+            self._schedule_redraw()
 
     def _remove_edge_visual(self, u: int, v: int):
-        if (u, v) in self.edge_items:
-            line, label = self.edge_items.pop((u, v))
-            self.edge_items.pop((v, u), None)
-            self.canvas.delete(line)
-            self.canvas.delete(label)
-
-    def _update_edge_label(self, u: int, v: int, text: str):
-        if (u, v) in self.edge_items:
-            _, label = self.edge_items[(u, v)]
-            self.canvas.itemconfig(label, text=text)
+        key = self._edge_key(u, v)
+        if key is None:
+            return
+        del self.edges[key]
+        if key in self.edge_items:
+            self._dematerialize_edge(*key)
+        if not self._edge_keys(u, v):
+            self.incident.get(u, set()).discard(v)
+            self.incident.get(v, set()).discard(u)
+        elif (v, u) in self.edge_items:
+            self._place_edge(v, u)
+        self._highlighted_edges.discard(self._path_key(*key))
+        if self._aggregated:
+            self._schedule_redraw()
+
+    def _update_edge_weight(self, u: int, v: int, w: float):
+        key = self._edge_key(u, v)
+        if key is None:
+            return
+        self.edges[key] = w
+        if key in self.edge_items:
+            _, label = self.edge_items[key]
+            self.canvas.itemconfig(label, text=f"{w:g}")
 
     def _item_under_cursor(self, x, y):
         items = self.canvas.find_overlapping(x, y, x, y)
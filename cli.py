@@ -0,0 +1,141 @@
+# cli.py
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple
+
+Pair = Tuple[str, str]
+
+
+def _cmd_serve(args) -> int:
+    from service import serve
+
+    try:
+        asyncio.run(serve(args.graph, args.host, args.port, args.unix, args.workers,
+                          args.batch_window / 1000.0, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def read_pairs(f: TextIO, sep: Optional[str] = None) -> Iterator[Pair]:
+    for lineno, line in enumerate(f, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = [p.strip() for p in line.split(sep)]
+        if len(parts) != 2:
+            raise ValueError(f"Строка {lineno}: ожидалась пара вершин, получено: {line!r}")
+        yield parts[0], parts[1]
+
+
+def chunked(pairs: Iterable[Pair], size: int) -> Iterator[List[Pair]]:
+    it = iter(pairs)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def solve_chunks(path: str, chunks: Iterable[List[Pair]],
+                 workers: int = 0) -> Iterator[Tuple[List[Pair], List[dict]]]:
+    from service import _init_worker, _solve_in_worker
+
+    if workers <= 0:
+        _init_worker(path)
+        for chunk in chunks:
+            yield chunk, _solve_in_worker(chunk)
+        return
+
+    # Не больше 2 * workers порций в работе одновременно: память ограничена,
+    # а порядок результатов совпадает с порядком входа.
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(path,)) as executor:
+        inflight = deque()
+        for chunk in chunks:
+            inflight.append((chunk, executor.submit(_solve_in_worker, chunk)))
+            if len(inflight) >= 2 * workers:
+                done, fut = inflight.popleft()
+                yield done, fut.result()
+        while inflight:
+            done, fut = inflight.popleft()
+            yield done, fut.result()
+
+
+def write_results(out: TextIO, results: Iterable[Tuple[List[Pair], List[dict]]],
+                  fmt: str = "csv") -> int:
+    count = 0
+    writer = csv.writer(out) if fmt == "csv" else None
+    if writer is not None:
+        writer.writerow(["start", "goal", "dist", "path", "error"])
+    for chunk, answers in results:
+        for (start, goal), r in zip(chunk, answers):
+            if writer is not None:
+                dist = "" if r.get("dist") is None else repr(r["dist"])
+                writer.writerow([start, goal, dist, " ".join(r.get("path") or ()), r.get("error", "")])
+            else:
+                row = {"start": start, "goal": goal}
+                row.update(r)
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        count += len(chunk)
+        out.flush()
+    return count
+
+
+def _cmd_query(args) -> int:
+    src = sys.stdin if args.pairs == "-" else open(args.pairs, "r", encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        chunks = chunked(read_pairs(src, args.sep), args.chunk_size)
+        count = write_results(out, solve_chunks(args.graph, chunks, args.workers), args.format)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+    print(f"Обработано запросов: {count}", file=sys.stderr)
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cli",
+                                     description="Поиск кратчайших путей без графического интерфейса.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_serve = sub.add_parser("serve", help="HTTP/JSON-сервис запросов к графу")
+    p_serve.add_argument("graph", help="файл графа (.json, .djkb, список рёбер, .gr)")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8765)
+    p_serve.add_argument("--unix", help="слушать Unix-сокет вместо TCP")
+    p_serve.add_argument("--workers", type=int, default=0,
+                         help="число процессов-обработчиков (0 — поток в этом процессе)")
+    p_serve.add_argument("--batch-window", type=float, default=2.0,
+                         help="окно группировки одиночных запросов, мс")
+    p_serve.add_argument("--max-batch", type=int, default=256)
+    p_serve.set_defaults(func=_cmd_serve)
+
+    p_query = sub.add_parser("query", help="пакетные запросы из файла или stdin")
+    p_query.add_argument("graph", help="файл графа (.json, .djkb, список рёбер, .gr)")
+    p_query.add_argument("pairs", nargs="?", default="-",
+                         help="файл пар «начало конец», по одной на строку (- — stdin)")
+    p_query.add_argument("-o", "--output", default="-", help="файл результатов (- — stdout)")
+    p_query.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    p_query.add_argument("--sep", default=None, help="разделитель в паре (по умолчанию пробелы)")
+    p_query.add_argument("--workers", type=int, default=0,
+                         help="число процессов-обработчиков (0 — в этом процессе)")
+    p_query.add_argument("--chunk-size", type=int, default=10000,
+                         help="пар в одной порции; внутри порции запросы группируются по началу")
+    p_query.set_defaults(func=_cmd_query)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+# contraction.py
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from stats import SearchStats
+
+WITNESS_SETTLE_LIMIT = 500
+
+
+def _witness_search(out_: Dict[int, Dict[int, float]], source: int, skip: int,
+                    max_dist: float, targets: set) -> Dict[int, float]:
+    dist = {source: 0.0}
+    pq = [(0.0, source)]
+    done = set()
+    remaining = len(targets)
+    while pq and len(done) < WITNESS_SETTLE_LIMIT:
+        d, u = heapq.heappop(pq)
+        if u in done:
+            continue
+        if d > max_dist:
+            break
+        done.add(u)
+        if u in targets:
+            remaining -= 1
+            if remaining == 0:
+                break
+        for v, w in out_[u].items():
+            if v == skip:
+                continue
+            nd = d + w
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                heapq.heappush(pq, (nd, v))
+    return dist
+
+
+def _needed_shortcuts(out_, in_, v: int) -> List[Tuple[int, int, float]]:
+    shortcuts = []
+    outs = out_[v]
+    if not outs:
+        return shortcuts
+    max_out = max(outs.values())
+    for u, w1 in in_[v].items():
+        if u == v:
+            continue
+        targets = {x for x in outs if x != u}
+        if not targets:
+            continue
+        witness = _witness_search(out_, u, v, w1 + max_out, targets)
+        for x in targets:
+            via = w1 + outs[x]
+            if witness.get(x, float("inf")) > via:
+                shortcuts.append((u, x, via))
+    return shortcuts
+
+
+class ContractionHierarchy:
+    def __init__(self, rank: Dict[int, int],
+                 up: Dict[int, Dict[int, float]],
+                 down: Dict[int, Dict[int, float]],
+                 middle: Dict[Tuple[int, int], int]):
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.middle = middle
+
+    @property
+    def num_shortcuts(self) -> int:
+        return len(self.middle)
+
+    @classmethod
+    def build(cls, graph) -> "ContractionHierarchy":
+        return cls.from_adj(graph.adj)
+
+    @classmethod
+    def from_adj(cls, adj: Dict[int, Dict[int, float]]) -> "ContractionHierarchy":
+        out_: Dict[int, Dict[int, float]] = {u: {} for u in adj}
+        in_: Dict[int, Dict[int, float]] = {u: {} for u in adj}
+        for u, nbrs in adj.items():
+            for v, w in nbrs.items():
+                if u == v:
+                    continue
+                out_[u][v] = w
+                in_.setdefault(v, {})[u] = w
+                out_.setdefault(v, {})
+        middle: Dict[Tuple[int, int], int] = {}
+        deleted = dict.fromkeys(out_, 0)
+
+        def priority(v: int) -> int:
+            added = len(_needed_shortcuts(out_, in_, v))
+            return added - len(in_[v]) - len(out_[v]) + deleted[v]
+
+        pq = [(priority(v), v) for v in out_]
+        heapq.heapify(pq)
+
+        rank: Dict[int, int] = {}
+        up: Dict[int, Dict[int, float]] = {}
+        down: Dict[int, Dict[int, float]] = {}
+
+        while pq:
+            _, v = heapq.heappop(pq)
+            p = priority(v)
+            if pq and p > pq[0][0]:
+                heapq.heappush(pq, (p, v))
+                continue
+
+            for u, x, w in _needed_shortcuts(out_, in_, v):
+                if w < out_[u].get(x, float("inf")):
+                    out_[u][x] = w
+                    in_[x][u] = w
+                    middle[(u, x)] = v
+
+            rank[v] = len(rank)
+            up[v] = out_.pop(v)
+            down[v] = in_.pop(v)
+            for x in up[v]:
+                in_[x].pop(v, None)
+                deleted[x] += 1
+            for u in down[v]:
+                out_[u].pop(v, None)
+                deleted[u] += 1
+
+        return cls(rank, up, down, middle)
+
+    def query(self, start: int, goal: int,
+              stats: Optional[SearchStats] = None) -> Tuple[float, Optional[List[int]]]:
+        if stats is not None:
+            stats.reset()
+            stats.phase("search")
+        result = self._query(start, goal, stats)
+        if stats is not None:
+            stats.finish()
+        return result
+
+    def _query(self, start: int, goal: int,
+               stats: Optional[SearchStats]) -> Tuple[float, Optional[List[int]]]:
+        if start not in self.rank or goal not in self.rank:
+            return float("inf"), None
+        if start == goal:
+            return 0.0, [start]
+
+        dists = ({start: 0.0}, {goal: 0.0})
+        prevs: Tuple[Dict[int, int], Dict[int, int]] = ({}, {})
+        pqs = ([(0.0, start)], [(0.0, goal)])
+        settled = (set(), set())
+        graphs = (self.up, self.down)
+
+        best = float("inf")
+        meet = None
+        side = 0
+        while pqs[0] or pqs[1]:
+            if not pqs[side] or pqs[side][0][0] >= best:
+                if not pqs[1 - side] or pqs[1 - side][0][0] >= best:
+                    break
+                side = 1 - side
+                continue
+            pq, dist, prev, done = pqs[side], dists[side], prevs[side], settled[side]
+            d, u = heapq.heappop(pq)
+            if stats is not None:
+                stats.pops += 1
+                if u in done:
+                    stats.stale_pops += 1
+            if u not in done:
+                done.add(u)
+                if stats is not None:
+                    stats.settled += 1
+                other = dists[1 - side]
+                if u in other and d + other[u] < best:
+                    best = d + other[u]
+                    meet = u
+                for v, w in graphs[side][u].items():
+                    nd = d + w
+                    if stats is not None:
+                        stats.relaxations += 1
+                    if nd < dist.get(v, float("inf")):
+                        dist[v] = nd
+                        prev[v] = u
+                        heapq.heappush(pq, (nd, v))
+                        if stats is not None:
+                            stats.pushes += 1
+                            stats.max_queue = max(stats.max_queue, len(pqs[0]) + len(pqs[1]))
+            side = 1 - side
+
+        if meet is None:
+            return float("inf"), None
+
+        if stats is not None:
+            stats.phase("path")
+        forward = [meet]
+        u = meet
+        while u in prevs[0]:
+            u = prevs[0][u]
+            forward.append(u)
+        forward.reverse()
+        backward = []
+        u = meet
+        while u in prevs[1]:
+            u = prevs[1][u]
+            backward.append(u)
+        return best, self._unpack(forward + backward)
+
+    def _unpack(self, path: List[int]) -> List[int]:
+        result = [path[0]]
+        for a, b in zip(path, path[1:]):
+            stack = [(a, b)]
+            while stack:
+                u, v = stack.pop()
+                m = self.middle.get((u, v))
+                if m is None:
+                    result.append(v)
+                else:
+                    stack.append((m, v))
+                    stack.append((u, m))
+        return result
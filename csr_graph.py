@@ -0,0 +1,60 @@
+# csr_graph.py
+from array import array
+from typing import Dict, List, Optional
+
+
+class CSRGraph:
+    __slots__ = ("undirected", "vids", "index", "offsets", "targets", "weights")
+
+    def __init__(self, undirected: bool, vids, offsets, targets, weights,
+                 index: Optional[Dict[int, int]] = None):
+        self.undirected = undirected
+        self.vids = vids
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        if index is None:
+            index = {vid: i for i, vid in enumerate(vids)}
+        self.index = index
+
+    @classmethod
+    def from_adj(cls, adj: Dict[int, Dict[int, float]], undirected: bool = True) -> "CSRGraph":
+        vids = array("q", sorted(adj.keys()))
+        index = {vid: i for i, vid in enumerate(vids)}
+        offsets = array("q", [0])
+        targets = array("q")
+        weights = array("d")
+        for vid in vids:
+            nbrs = adj[vid]
+            for v, w in nbrs.items():
+                if v not in index:
+                    raise ValueError("Ребро ведёт в несуществующую вершину.")
+                targets.append(index[v])
+                weights.append(w)
+            offsets.append(len(targets))
+        return cls(undirected, vids, offsets, targets, weights, index)
+
+    @classmethod
+    def from_graph(cls, graph) -> "CSRGraph":
+        return cls.from_adj(graph.adj, graph.undirected)
+
+    def __len__(self) -> int:
+        return len(self.vids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.targets)
+
+    def neighbors(self, vid: int) -> List[int]:
+        i = self.index[vid]
+        return [self.vids[t] for t in self.targets[self.offsets[i]:self.offsets[i + 1]]]
+
+    def to_adj(self) -> Dict[int, Dict[int, float]]:
+        adj: Dict[int, Dict[int, float]] = {}
+        vids, offsets, targets, weights = self.vids, self.offsets, self.targets, self.weights
+        for i, vid in enumerate(vids):
+            adj[vid] = {vids[targets[k]]: weights[k] for k in range(offsets[i], offsets[i + 1])}
+        return adj
+
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.vids, self.offsets, self.targets, self.weights))
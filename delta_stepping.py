@@ -0,0 +1,205 @@
+# delta_stepping.py
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Set, Tuple
+
+from csr_graph import CSRGraph
+from dijkstra import ShortestPathTree, shortest_path_tree
+
+# Ниже этих порогов процессы не окупают пересылку: граф решается обычным
+# Дейкстрой, а маленькие фронты корзины релаксируются в главном процессе.
+PARALLEL_MIN_EDGES = 1_000_000
+PARALLEL_MIN_FRONTIER = 2048
+
+INF = float("inf")
+
+_worker_views: Optional[Tuple] = None
+_worker_shm: List[SharedMemory] = []
+
+Relaxed = Tuple[array, array, array]
+
+
+def auto_delta(csr: CSRGraph) -> float:
+    # Meyer–Sanders: при весах из [0, W] и средней степени d хорош delta ~ W / d.
+    if not csr.num_edges:
+        return 1.0
+    max_w = max(csr.weights)
+    degree = csr.num_edges / max(1, len(csr))
+    delta = max_w / max(1.0, degree)
+    return delta if delta > 0 else 1.0
+
+
+def _relax(offsets, targets, weights, dist, us: array, delta: float, light: bool) -> Relaxed:
+    best: Dict[int, float] = {}
+    parent: Dict[int, int] = {}
+    for u in us:
+        du = dist[u]
+        for k in range(offsets[u], offsets[u + 1]):
+            w = weights[k]
+            if (w <= delta) != light:
+                continue
+            v = targets[k]
+            nd = du + w
+            if nd < dist[v] and nd < best.get(v, INF):
+                best[v] = nd
+                parent[v] = u
+    vs = array("q", best.keys())
+    return vs, array("d", best.values()), array("q", [parent[v] for v in vs])
+
+
+def _attach(name: str) -> SharedMemory:
+    # Процессы пула делят трекер ресурсов с главным: повторная регистрация того же
+    # имени ничего не меняет, а удаляет блоки только DeltaStepping.close().
+    try:
+        return SharedMemory(name, track=False)
+    except TypeError:
+        return SharedMemory(name)
+
+
+def _init_worker(names: Tuple[str, str, str, str], sizes: Tuple[int, int, int, int]):
+    global _worker_views
+    views = []
+    for name, size, code in zip(names, sizes, ("q", "q", "d", "d")):
+        shm = _attach(name)
+        _worker_shm.append(shm)
+        views.append(shm.buf.cast(code)[:size])
+    _worker_views = tuple(views)
+
+
+def _relax_in_worker(us: array, delta: float, light: bool) -> Relaxed:
+    offsets, targets, weights, dist = _worker_views
+    return _relax(offsets, targets, weights, dist, us, delta, light)
+
+
+def _shared(data: array) -> SharedMemory:
+    shm = SharedMemory(create=True, size=max(1, data.itemsize * len(data)))
+    shm.buf[:data.itemsize * len(data)] = data.tobytes()
+    return shm
+
+
+class DeltaStepping:
+    def __init__(self, graph, workers: Optional[int] = None, delta: Optional[float] = None):
+        self.csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+        self.delta = delta if delta is not None else auto_delta(self.csr)
+        if self.delta <= 0:
+            raise ValueError("delta должна быть положительной.")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self.workers = max(1, workers)
+
+        n = len(self.csr)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._shm: List[SharedMemory] = []
+        self.dist = None
+        self._local = None
+        try:
+            self._setup(n)
+        except BaseException:
+            self.close()
+            raise
+
+    def _setup(self, n: int):
+        csr = self.csr
+        # Компактная копия графа и массив расстояний лежат в разделяемой памяти:
+        # рабочие процессы читают их без копирования, пишет только главный процесс.
+        for data in (csr.offsets, csr.targets, csr.weights, array("d", [INF]) * n):
+            self._shm.append(_shared(data))
+        self._sizes = (len(csr.offsets), len(csr.targets), len(csr.weights), n)
+        self.dist = self._shm[3].buf.cast("d")[:n]
+        self._local = (self._shm[0].buf.cast("q")[:self._sizes[0]],
+                       self._shm[1].buf.cast("q")[:self._sizes[1]],
+                       self._shm[2].buf.cast("d")[:self._sizes[2]])
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(tuple(s.name for s in self._shm), self._sizes))
+
+    def close(self):
+        # Блоки разделяемой памяти удаляются, даже если пул упал или завершился с ошибкой.
+        try:
+            if self._pool is not None:
+                pool, self._pool = self._pool, None
+                pool.shutdown(cancel_futures=True)
+        finally:
+            if self._local is not None:
+                for view in self._local:
+                    view.release()
+                self._local = None
+            if self.dist is not None:
+                self.dist.release()
+                self.dist = None
+            while self._shm:
+                shm = self._shm.pop()
+                shm.close()
+                shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _relax_set(self, frontier: Set[int], light: bool) -> List[Relaxed]:
+        us = array("q", frontier)
+        if self._pool is None or len(us) < PARALLEL_MIN_FRONTIER:
+            return [_relax(*self._local, self.dist, us, self.delta, light)]
+        parts = self.workers * 2
+        step = (len(us) + parts - 1) // parts
+        chunks = [us[i:i + step] for i in range(0, len(us), step)]
+        return list(self._pool.map(_relax_in_worker, chunks,
+                                   [self.delta] * len(chunks), [light] * len(chunks)))
+
+    def sssp(self, start: int) -> ShortestPathTree:
+        csr = self.csr
+        s = csr.index.get(start)
+        if s is None:
+            return ShortestPathTree(start, {}, {}, True)
+        n = len(csr)
+        dist, delta = self.dist, self.delta
+        dist[:] = memoryview(array("d", [INF]) * n)
+        parent = array("q", [-1]) * n
+        buckets: Dict[int, Set[int]] = {0: {s}}
+        dist[s] = 0.0
+
+        def apply(results: List[Relaxed]):
+            for vs, nds, us in results:
+                for v, nd, u in zip(vs, nds, us):
+                    old = dist[v]
+                    if nd < old:
+                        if old != INF:
+                            b = buckets.get(int(old // delta))
+                            if b is not None:
+                                b.discard(v)
+                        dist[v] = nd
+                        parent[v] = u
+                        buckets.setdefault(int(nd // delta), set()).add(v)
+
+        while buckets:
+            i = min(buckets)
+            settled: Set[int] = set()
+            while buckets.get(i):
+                frontier = buckets.pop(i)
+                settled |= frontier
+                apply(self._relax_set(frontier, light=True))
+            buckets.pop(i, None)
+            apply(self._relax_set(settled, light=False))
+
+        vids = csr.vids
+        dist_out = {vids[i]: dist[i] for i in range(n) if dist[i] != INF}
+        prev = {vids[i]: vids[parent[i]] for i in range(n) if parent[i] >= 0}
+        return ShortestPathTree(start, dist_out, prev, True)
+
+
+def delta_stepping(graph, start: int, workers: Optional[int] = None,
+                   delta: Optional[float] = None) -> ShortestPathTree:
+    csr = graph if isinstance(graph, CSRGraph) else None
+    num_edges = csr.num_edges if csr is not None else sum(len(n) for n in graph.adj.values())
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or num_edges < PARALLEL_MIN_EDGES:
+        adj = csr.to_adj() if csr is not None else graph.adj
+        return shortest_path_tree(adj, start)
+    with DeltaStepping(graph, workers, delta) as engine:
+        return engine.sssp(start)
@@ -1,11 +1,27 @@
 # dijkstra.py
 import heapq
-from typing import Dict, Tuple, Optional, List
+from typing import Callable, Dict, Iterable, Tuple, Optional, List
+
+from pqueue import LazyHeap, make_queue
+from stats import SearchStats
 
 
 def dijkstra(adj: Dict[int, Dict[int, float]],
              start: int,
-             goal: int) -> Tuple[float, Optional[List[int]]]:
+             goal: int,
+             queue: Optional[str] = None,
+             stats: Optional[SearchStats] = None,
+             weights: Optional[Tuple[bool, float]] = None) -> Tuple[float, Optional[List[int]]]:
+    if stats is not None:
+        stats.reset()
+        stats.phase("init")
+    if queue in ("auto", "heapq"):
+        queue = None
+    if queue is not None:
+        return _dijkstra_queue(adj, start, goal, make_queue(queue, adj, weights), stats)
+    if stats is not None:
+        return _dijkstra_queue(adj, start, goal, LazyHeap(), stats)
+
     dist = {start: 0.0}
     prev = {}
     pq = [(0.0, start)]
@@ -34,3 +50,408 @@ def dijkstra(adj: Dict[int, Dict[int, float]],
                 heapq.heappush(pq, (nd, v))
 
     return float("inf"), None
+
+
+def _dijkstra_queue(adj: Dict[int, Dict[int, float]],
+                    start: int,
+                    goal: int,
+                    pq,
+                    stats: Optional[SearchStats]) -> Tuple[float, Optional[List[int]]]:
+    if stats is not None:
+        stats.phase("search")
+        stats.pushes = stats.max_queue = 1
+    dist = {start: 0.0}
+    prev = {}
+    pq.push(0.0, start)
+
+    visited = set()
+
+    while pq:
+        d, u = pq.pop()
+        if u in visited:
+            if stats is not None:
+                stats.pops += 1
+                stats.stale_pops += 1
+            continue
+        visited.add(u)
+        if stats is not None:
+            stats.pops += 1
+            stats.settled += 1
+            stats.tick(d)
+
+        if u == goal:
+            if stats is not None:
+                stats.phase("path")
+            path = [u]
+            while u in prev:
+                u = prev[u]
+                path.append(u)
+            path.reverse()
+            if stats is not None:
+                stats.finish()
+            return d, path
+
+        for v, w in adj.get(u, {}).items():
+            if v in visited:
+                continue
+            nd = d + w
+            if stats is not None:
+                stats.relaxations += 1
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                prev[v] = u
+                pq.decrease_key(nd, v)
+                if stats is not None:
+                    stats.pushes += 1
+                    if len(pq) > stats.max_queue:
+                        stats.max_queue = len(pq)
+
+    if stats is not None:
+        stats.finish()
+    return float("inf"), None
+
+
+class ShortestPathTree:
+    def __init__(self, start: int, dist: Dict[int, float], prev: Dict[int, int], complete: bool):
+        self.start = start
+        self.dist = dist
+        self.prev = prev
+        self.complete = complete
+
+    def __contains__(self, v: int) -> bool:
+        return v in self.dist
+
+    def reached(self, v: int) -> bool:
+        return v in self.dist
+
+    def distance(self, v: int) -> float:
+        return self.dist.get(v, float("inf"))
+
+    def predecessor(self, v: int) -> Optional[int]:
+        return self.prev.get(v)
+
+    def path_to(self, v: int) -> Optional[List[int]]:
+        if v not in self.dist:
+            return None
+        path = [v]
+        while v in self.prev:
+            v = self.prev[v]
+            path.append(v)
+        path.reverse()
+        return path
+
+    def query(self, goal: int) -> Tuple[float, Optional[List[int]]]:
+        return self.distance(goal), self.path_to(goal)
+
+
+def shortest_path_tree(adj: Dict[int, Dict[int, float]],
+                       start: int,
+                       max_dist: Optional[float] = None,
+                       targets: Optional[Iterable[int]] = None,
+                       stats: Optional[SearchStats] = None) -> ShortestPathTree:
+    if stats is not None:
+        stats.reset()
+        stats.phase("search")
+    dist = {start: 0.0}
+    prev = {}
+    settled: Dict[int, float] = {}
+    pq = [(0.0, start)]
+    remaining = set(targets) if targets is not None else None
+    limit = float("inf") if max_dist is None else max_dist
+    complete = True
+
+    while pq:
+        d, u = heapq.heappop(pq)
+        if u in settled:
+            continue
+        if d > limit:
+            complete = False
+            break
+        settled[u] = d
+        if stats is not None:
+            stats.settled += 1
+            stats.tick(d)
+
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                complete = False
+                break
+
+        nbrs = adj.get(u, {})
+        for v, w in nbrs.items():
+            nd = d + w
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(pq, (nd, v))
+        if stats is not None:
+            stats.relaxations += len(nbrs)
+
+    if stats is not None:
+        stats.finish()
+    tree_prev = {v: u for v, u in prev.items() if v in settled}
+    return ShortestPathTree(start, settled, tree_prev, complete)
+
+
+def dijkstra_csr(csr, start: int, goal: int) -> Tuple[float, Optional[List[int]]]:
+    index = csr.index
+    if start not in index or goal not in index:
+        return float("inf"), None
+    s, t = index[start], index[goal]
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+
+    inf = float("inf")
+    dist = [inf] * len(csr.vids)
+    prev = [-1] * len(csr.vids)
+    done = bytearray(len(csr.vids))
+    dist[s] = 0.0
+    pq = [(0.0, s)]
+
+    while pq:
+        d, u = heapq.heappop(pq)
+        if done[u]:
+            continue
+        done[u] = 1
+
+        if u == t:
+            vids = csr.vids
+            path = [vids[u]]
+            while prev[u] >= 0:
+                u = prev[u]
+                path.append(vids[u])
+            path.reverse()
+            return d, path
+
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets[k]
+            nd = d + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(pq, (nd, v))
+
+    return inf, None
+
+
+def bidirectional_dijkstra(adj: Dict[int, Dict[int, float]],
+                           radj: Dict[int, Dict[int, float]],
+                           start: int,
+                           goal: int,
+                           stats: Optional[SearchStats] = None) -> Tuple[float, Optional[List[int]]]:
+    if stats is not None:
+        stats.reset()
+        stats.phase("search")
+        stats.pushes = stats.max_queue = 2
+    if start == goal:
+        if stats is not None:
+            stats.finish()
+        return 0.0, [start]
+
+    dists = ({start: 0.0}, {goal: 0.0})
+    prevs = ({}, {})
+    pqs = ([(0.0, start)], [(0.0, goal)])
+    settled = (set(), set())
+    graphs = (adj, radj)
+
+    best = float("inf")
+    meet = None
+
+    while pqs[0] and pqs[1]:
+        if pqs[0][0][0] + pqs[1][0][0] >= best:
+            break
+
+        side = 0 if len(pqs[0]) <= len(pqs[1]) else 1
+        pq, dist, prev, done = pqs[side], dists[side], prevs[side], settled[side]
+        other = dists[1 - side]
+
+        d, u = heapq.heappop(pq)
+        if u in done:
+            if stats is not None:
+                stats.pops += 1
+                stats.stale_pops += 1
+            continue
+        done.add(u)
+        if stats is not None:
+            stats.pops += 1
+            stats.settled += 1
+            stats.tick(d)
+
+        for v, w in graphs[side].get(u, {}).items():
+            nd = d + w
+            if stats is not None:
+                stats.relaxations += 1
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(pq, (nd, v))
+                if stats is not None:
+                    stats.pushes += 1
+                    if len(pqs[0]) + len(pqs[1]) > stats.max_queue:
+                        stats.max_queue = len(pqs[0]) + len(pqs[1])
+            if v in other and nd + other[v] < best:
+                best = nd + other[v]
+                meet = v
+
+    if stats is not None:
+        stats.phase("path")
+    if meet is None:
+        if stats is not None:
+            stats.finish()
+        return float("inf"), None
+
+    path = [meet]
+    u = meet
+    while u in prevs[0]:
+        u = prevs[0][u]
+        path.append(u)
+    path.reverse()
+    u = meet
+    while u in prevs[1]:
+        u = prevs[1][u]
+        path.append(u)
+    if stats is not None:
+        stats.finish()
+    return best, path
+
+
+def astar(adj: Dict[int, Dict[int, float]],
+          start: int,
+          goal: int,
+          heuristic: Callable[[int, int], float],
+          stats: Optional[SearchStats] = None) -> Tuple[float, Optional[List[int]]]:
+    if stats is not None:
+        stats.reset()
+        stats.phase("search")
+        stats.pushes = stats.max_queue = 1
+    dist = {start: 0.0}
+    prev = {}
+    pq = [(heuristic(start, goal), 0.0, start)]
+
+    visited = set()
+
+    while pq:
+        _, d, u = heapq.heappop(pq)
+        if u in visited:
+            if stats is not None:
+                stats.pops += 1
+                stats.stale_pops += 1
+            continue
+        visited.add(u)
+        if stats is not None:
+            stats.pops += 1
+            stats.settled += 1
+            stats.tick(d)
+
+        if u == goal:
+            if stats is not None:
+                stats.phase("path")
+            path = [u]
+            while u in prev:
+                u = prev[u]
+                path.append(u)
+            path.reverse()
+            if stats is not None:
+                stats.finish()
+            return d, path
+
+        for v, w in adj.get(u, {}).items():
+            nd = d + w
+            if stats is not None:
+                stats.relaxations += 1
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(pq, (nd + heuristic(v, goal), nd, v))
+                if stats is not None:
+                    stats.pushes += 1
+                    if len(pq) > stats.max_queue:
+                        stats.max_queue = len(pq)
+
+    if stats is not None:
+        stats.finish()
+    return float("inf"), None
+
+
+METHODS = ("dijkstra", "bidirectional", "astar")
+
+
+def shortest_path(graph, start: int, goal: int,
+                  method: str = "dijkstra",
+                  heuristic: Optional[Callable[[int, int], float]] = None,
+                  queue: Optional[str] = None,
+                  stats: Optional[SearchStats] = None) -> Tuple[float, Optional[List[int]]]:
+    if method not in METHODS:
+        raise ValueError(f"Неизвестный метод поиска: {method}")
+    # Индекс связности работает, только если его построили заранее:
+    # graph.connectivity.rebuild(); сам поиск его не пересчитывает.
+    index = getattr(graph, "connectivity", None)
+    if index is not None and index.known_unreachable(start, goal):
+        # Разные компоненты: ответ известен без поиска.
+        if stats is not None:
+            stats.reset()
+            stats.finish()
+        return float("inf"), None
+    if method == "dijkstra":
+        weights = graph.weight_stats() if queue in ("radix", "dial") else None
+        return dijkstra(graph.adj, start, goal, queue, stats, weights)
+    if method == "bidirectional":
+        return bidirectional_dijkstra(graph.adj, graph.radj, start, goal, stats)
+    h = heuristic or (lambda v, g: 0.0)
+    if index is not None and index.built and not graph.undirected:
+        # Вершины, из которых цель недостижима, уходят в конец очереди и не раскрываются.
+        # Пустой индекс (rebuild() не вызывался) ничего не отсекает — обёртка не нужна.
+        inner = h
+        h = lambda v, g: float("inf") if index.known_unreachable(v, g) else inner(v, g)
+    return astar(graph.adj, start, goal, h, stats)
+
+
+def profile_path(graph, start: int, goal: int,
+                 method: str = "dijkstra",
+                 heuristic: Optional[Callable[[int, int], float]] = None,
+                 queue: Optional[str] = None,
+                 hook: Optional[Callable[[str, SearchStats], None]] = None
+                 ) -> Tuple[float, Optional[List[int]], SearchStats]:
+    # То же, что shortest_path, но счётчики поиска возвращаются вместе с ответом.
+    stats = SearchStats(hook=hook)
+    dist, path = shortest_path(graph, start, goal, method, heuristic, queue, stats)
+    return dist, path, stats
+
+
+def csr_distances(csr, start: int, targets: List[int]) -> List[float]:
+    inf = float("inf")
+    n = len(csr.vids)
+    index = csr.index
+    s = index.get(start)
+    if s is None:
+        return [inf] * len(targets)
+    want = {}
+    for t in targets:
+        i = index.get(t)
+        if i is not None:
+            want[i] = inf
+    offsets, targets_arr, weights = csr.offsets, csr.targets, csr.weights
+
+    dist = [inf] * n
+    done = bytearray(n)
+    dist[s] = 0.0
+    pq = [(0.0, s)]
+    remaining = len(want)
+
+    while pq and remaining:
+        d, u = heapq.heappop(pq)
+        if done[u]:
+            continue
+        done[u] = 1
+        if u in want:
+            want[u] = d
+            remaining -= 1
+
+        for k in range(offsets[u], offsets[u + 1]):
+            v = targets_arr[k]
+            nd = d + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(pq, (nd, v))
+
+    return [want.get(index.get(t), inf) for t in targets]
@@ -0,0 +1,190 @@
+# dynamic_sssp.py
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from graph_model import Graph
+
+
+class DynamicShortestPathTree:
+    def __init__(self, graph: Graph, source: int):
+        self.graph = graph
+        self.source = source
+        self.dist: Dict[int, float] = {}
+        self.parent: Dict[int, int] = {}
+        self._children: Dict[int, Set[int]] = {}
+        self.rebuild()
+
+    @classmethod
+    def from_tree(cls, graph: Graph, source: int,
+                  dist: Dict[int, float], parent: Dict[int, int]) -> "DynamicShortestPathTree":
+        tree = cls.__new__(cls)
+        tree.graph = graph
+        tree.source = source
+        tree.dist = dict(dist)
+        tree.parent = dict(parent)
+        tree._children = {}
+        for v, u in tree.parent.items():
+            tree._children.setdefault(u, set()).add(v)
+        tree._version = graph.version
+        return tree
+
+    def rebuild(self):
+        graph = self.graph
+        self.dist = {}
+        self.parent = {}
+        self._children = {}
+        self._version = graph.version
+        if self.source not in graph.vertices:
+            return
+        self.dist[self.source] = 0.0
+        self._propagate([(0.0, self.source)])
+
+    @property
+    def stale(self) -> bool:
+        return self._version != self.graph.version
+
+    def _ensure_fresh(self):
+        if self._version != self.graph.version:
+            self.rebuild()
+
+    def _set_parent(self, v: int, u: Optional[int]):
+        old = self.parent.pop(v, None)
+        if old is not None:
+            self._children[old].discard(v)
+        if u is not None:
+            self.parent[v] = u
+            self._children.setdefault(u, set()).add(v)
+
+    def _propagate(self, pq: List[Tuple[float, int]]):
+        adj, dist = self.graph.adj, self.dist
+        heapq.heapify(pq)
+        while pq:
+            d, u = heapq.heappop(pq)
+            if d > dist.get(u, float("inf")):
+                continue
+            for v, w in adj.get(u, {}).items():
+                nd = d + w
+                if nd < dist.get(v, float("inf")):
+                    dist[v] = nd
+                    self._set_parent(v, u)
+                    heapq.heappush(pq, (nd, v))
+
+    def _subtree(self, root: int) -> Set[int]:
+        seen = {root}
+        stack = [root]
+        while stack:
+            u = stack.pop()
+            for c in self._children.get(u, ()):
+                if c not in seen:
+                    seen.add(c)
+                    stack.append(c)
+        return seen
+
+    def _repair_increase(self, roots: Iterable[int]):
+        affected: Set[int] = set()
+        for r in roots:
+            if r in self.dist and r not in affected:
+                affected |= self._subtree(r)
+        affected.discard(self.source)
+        if not affected:
+            return
+        for v in affected:
+            self.dist.pop(v, None)
+            self._set_parent(v, None)
+
+        dist, radj = self.dist, self.graph.radj
+        pq = []
+        for v in affected:
+            best, best_u = float("inf"), None
+            for u, w in radj.get(v, {}).items():
+                if u in affected or u not in dist:
+                    continue
+                if dist[u] + w < best:
+                    best, best_u = dist[u] + w, u
+            if best_u is not None:
+                dist[v] = best
+                self._set_parent(v, best_u)
+                pq.append((best, v))
+        self._propagate(pq)
+
+    def _repair_decrease(self, u: int, v: int, w: float):
+        du = self.dist.get(u)
+        if du is None or du + w >= self.dist.get(v, float("inf")):
+            return
+        self.dist[v] = du + w
+        self._set_parent(v, u)
+        self._propagate([(du + w, v)])
+
+    def _arcs(self, u: int, v: int) -> List[Tuple[int, int]]:
+        return [(u, v), (v, u)] if self.graph.undirected else [(u, v)]
+
+    def add_vertex(self, name: Optional[str] = None) -> int:
+        self._ensure_fresh()
+        vid = self.graph.add_vertex(name)
+        self._version = self.graph.version
+        return vid
+
+    def add_edge(self, u: int, v: int, w: float):
+        self._ensure_fresh()
+        if self.graph.has_edge(u, v):
+            # Повторное добавление меняет вес: при увеличении нужен ремонт поддерева.
+            self.update_edge_weight(u, v, w)
+            return
+        self.graph.add_edge(u, v, w)
+        self._version = self.graph.version
+        for a, b in self._arcs(u, v):
+            self._repair_decrease(a, b, w)
+
+    def update_edge_weight(self, u: int, v: int, w: float):
+        self._ensure_fresh()
+        old = self.graph.adj[u][v] if self.graph.has_edge(u, v) else None
+        self.graph.update_edge_weight(u, v, w)
+        self._version = self.graph.version
+        if w < old:
+            for a, b in self._arcs(u, v):
+                self._repair_decrease(a, b, w)
+        elif w > old:
+            self._repair_increase(b for a, b in self._arcs(u, v) if self.parent.get(b) == a)
+
+    def remove_edge(self, u: int, v: int):
+        self._ensure_fresh()
+        self.graph.remove_edge(u, v)
+        self._version = self.graph.version
+        self._repair_increase(b for a, b in self._arcs(u, v) if self.parent.get(b) == a)
+
+    def remove_vertex(self, vid: int) -> List[Tuple[int, int]]:
+        self._ensure_fresh()
+        removed = self.graph.remove_vertex(vid)
+        self._version = self.graph.version
+        if vid == self.source:
+            self.dist.clear()
+            self.parent.clear()
+            self._children.clear()
+            return removed
+        roots = list(self._children.get(vid, ()))
+        if vid in self.dist:
+            del self.dist[vid]
+            self._set_parent(vid, None)
+        self._children.pop(vid, None)
+        for c in roots:
+            self.parent.pop(c, None)
+        self._repair_increase(roots)
+        return removed
+
+    def distance(self, v: int) -> float:
+        self._ensure_fresh()
+        return self.dist.get(v, float("inf"))
+
+    def path_to(self, v: int) -> Optional[List[int]]:
+        self._ensure_fresh()
+        if v not in self.dist:
+            return None
+        path = [v]
+        while v in self.parent:
+            v = self.parent[v]
+            path.append(v)
+        path.reverse()
+        return path
+
+    def query(self, goal: int) -> Tuple[float, Optional[List[int]]]:
+        return self.distance(goal), self.path_to(goal)
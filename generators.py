@@ -0,0 +1,117 @@
+# generators.py
+import math
+import random
+from typing import Dict, Tuple
+
+from graph_model import Graph
+
+Positions = Dict[int, Tuple[float, float]]
+
+
+def grid_graph(rows: int, cols: int, seed: int = 0,
+               min_w: float = 1.0, max_w: float = 10.0) -> Tuple[Graph, Positions]:
+    rng = random.Random(seed)
+    g = Graph(undirected=True)
+    positions: Positions = {}
+    for r in range(rows):
+        for c in range(cols):
+            vid = g.add_vertex(f"{r}_{c}")
+            positions[vid] = (c * 40.0, r * 40.0)
+    for r in range(rows):
+        for c in range(cols):
+            vid = r * cols + c + 1
+            if c + 1 < cols:
+                g.add_edge(vid, vid + 1, rng.uniform(min_w, max_w))
+            if r + 1 < rows:
+                g.add_edge(vid, vid + cols, rng.uniform(min_w, max_w))
+    return g, positions
+
+
+def random_geometric_graph(n: int, radius: float, seed: int = 0,
+                           size: float = 1000.0) -> Tuple[Graph, Positions]:
+    rng = random.Random(seed)
+    g = Graph(undirected=True)
+    positions: Positions = {}
+    cells: Dict[Tuple[int, int], list] = {}
+    for _ in range(n):
+        vid = g.add_vertex()
+        x, y = rng.uniform(0, size), rng.uniform(0, size)
+        positions[vid] = (x, y)
+        cells.setdefault((int(x // radius), int(y // radius)), []).append(vid)
+    for (cx, cy), members in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for v in cells.get((cx + dx, cy + dy), ()):
+                    for u in members:
+                        if u < v:
+                            d = math.dist(positions[u], positions[v])
+                            if d <= radius:
+                                g.add_edge(u, v, d)
+    return g, positions
+
+
+def erdos_renyi_graph(n: int, avg_degree: float, seed: int = 0,
+                      undirected: bool = True, max_w: float = 100.0) -> Tuple[Graph, Positions]:
+    rng = random.Random(seed)
+    g = Graph(undirected=undirected)
+    positions: Positions = {}
+    for _ in range(n):
+        vid = g.add_vertex()
+        positions[vid] = (rng.uniform(0, 1000), rng.uniform(0, 1000))
+    m = int(n * avg_degree / (2 if undirected else 1))
+    for _ in range(m):
+        u, v = rng.randint(1, n), rng.randint(1, n)
+        if u != v:
+            g.add_edge(u, v, rng.uniform(1, max_w))
+    return g, positions
+
+
+def scale_free_graph(n: int, m: int = 3, seed: int = 0,
+                     max_w: float = 100.0) -> Tuple[Graph, Positions]:
+    rng = random.Random(seed)
+    g = Graph(undirected=True)
+    positions: Positions = {}
+    targets = []
+    for i in range(n):
+        vid = g.add_vertex()
+        positions[vid] = (rng.uniform(0, 1000), rng.uniform(0, 1000))
+        if i == 0:
+            continue
+        chosen = {rng.choice(targets) for _ in range(m)} if targets else {1}
+        for u in chosen:
+            if u != vid:
+                g.add_edge(vid, u, rng.uniform(1, max_w))
+                targets.extend((vid, u))
+    return g, positions
+
+
+def road_like_graph(rows: int, cols: int, seed: int = 0,
+                    drop: float = 0.15, highway_every: int = 8) -> Tuple[Graph, Positions]:
+    rng = random.Random(seed)
+    g = Graph(undirected=True)
+    positions: Positions = {}
+    for r in range(rows):
+        for c in range(cols):
+            vid = g.add_vertex(f"{r}_{c}")
+            positions[vid] = (c * 40.0 + rng.uniform(-12, 12), r * 40.0 + rng.uniform(-12, 12))
+    for r in range(rows):
+        for c in range(cols):
+            vid = r * cols + c + 1
+            for nb, ok in ((vid + 1, c + 1 < cols), (vid + cols, r + 1 < rows)):
+                if not ok:
+                    continue
+                highway = r % highway_every == 0 or c % highway_every == 0
+                if not highway and rng.random() < drop:
+                    continue
+                d = math.dist(positions[vid], positions[nb])
+                g.add_edge(vid, nb, d * (1.0 if highway else rng.uniform(1.3, 2.5)))
+    return g, positions
+
+
+GENERATORS = {
+    "grid": lambda scale, seed: grid_graph(scale, scale, seed),
+    "geometric": lambda scale, seed: random_geometric_graph(scale * scale, 1000.0 * 1.6 / scale, seed),
+    "erdos_renyi": lambda scale, seed: erdos_renyi_graph(scale * scale, 4.0, seed),
+    "scale_free": lambda scale, seed: scale_free_graph(scale * scale, 2, seed),
+    "road": lambda scale, seed: road_like_graph(scale, scale, seed),
+}
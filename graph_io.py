@@ -0,0 +1,282 @@
+# graph_io.py
+import bisect
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from graph_model import Graph
+from csr_graph import CSRGraph
+
+JSON_FORMAT = "dijkstra_tk_v1"
+BINARY_MAGIC = b"DJKB"
+BINARY_VERSION = 1
+
+Positions = Dict[int, Tuple[float, float]]
+
+# magic, version, flags, n, m, names_size
+_HEADER = struct.Struct("<4sIIxxxxQQQ")
+
+
+def collect_edges(graph: Graph) -> List[dict]:
+    edges = []
+    seen = set()
+    for u, nbrs in graph.adj.items():
+        for v, w in nbrs.items():
+            key = (min(u, v), max(u, v)) if graph.undirected else (u, v)
+            if key in seen:
+                continue
+            seen.add(key)
+            edges.append({"u": key[0], "v": key[1] if graph.undirected else v, "w": w})
+    return edges
+
+
+def graph_to_dict(graph: Graph, positions: Positions) -> dict:
+    return {
+        "format": JSON_FORMAT,
+        "undirected": graph.undirected,
+        "vertices": [
+            {
+                "vid": vid,
+                "name": v.name,
+                "x": float(positions.get(vid, (0, 0))[0]),
+                "y": float(positions.get(vid, (0, 0))[1]),
+            }
+            for vid, v in graph.vertices.items()
+        ],
+        "edges": collect_edges(graph),
+    }
+
+
+def graph_from_dict(data: dict) -> Tuple[Graph, Positions]:
+    if data.get("format") != JSON_FORMAT:
+        raise ValueError("Неверный или неподдерживаемый формат файла.")
+    graph = Graph(undirected=bool(data.get("undirected", True)))
+    positions: Positions = {}
+    for item in data.get("vertices", []):
+        vid = int(item["vid"])
+        graph.add_vertex_explicit(vid, str(item["name"]))
+        positions[vid] = (float(item.get("x", 0)), float(item.get("y", 0)))
+    for e in data.get("edges", []):
+        u = int(e["u"])
+        v = int(e["v"])
+        if not graph.has_edge(u, v):
+            graph.add_edge(u, v, float(e["w"]))
+    return graph, positions
+
+
+def save_json(path: str, graph: Graph, positions: Positions):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(graph_to_dict(graph, positions), f, ensure_ascii=False, indent=2)
+
+
+def load_json(path: str) -> Tuple[Graph, Positions]:
+    with open(path, "r", encoding="utf-8") as f:
+        return graph_from_dict(json.load(f))
+
+
+def is_binary_file(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def _pad(n: int) -> int:
+    return (-n) % 8
+
+
+def save_binary(path: str, graph: Graph, positions: Positions):
+    csr = CSRGraph.from_graph(graph)
+    n, m = len(csr.vids), csr.num_edges
+
+    encoded = [graph.vertices[vid].name.encode("utf-8") for vid in csr.vids]
+    name_offsets = array("q", [0])
+    for b in encoded:
+        name_offsets.append(name_offsets[-1] + len(b))
+    name_order = array("q", sorted(range(n), key=lambda i: encoded[i]))
+    names = b"".join(encoded)
+
+    xs = array("d", (float(positions.get(vid, (0, 0))[0]) for vid in csr.vids))
+    ys = array("d", (float(positions.get(vid, (0, 0))[1]) for vid in csr.vids))
+
+    flags = 1 if graph.undirected else 0
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags, n, m, len(names)))
+        for a in (csr.vids, xs, ys, name_offsets, name_order, csr.offsets, csr.targets, csr.weights):
+            a.tofile(f)
+        f.write(names)
+        f.write(b"\0" * _pad(len(names)))
+
+
+class SortedIndex:
+    __slots__ = ("_keys",)
+
+    def __init__(self, keys):
+        self._keys = keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _find(self, key: int) -> int:
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return i
+        return -1
+
+    def __contains__(self, key) -> bool:
+        return self._find(key) >= 0
+
+    def __getitem__(self, key: int) -> int:
+        i = self._find(key)
+        if i < 0:
+            raise KeyError(key)
+        return i
+
+    def get(self, key: int, default=None):
+        i = self._find(key)
+        return default if i < 0 else i
+
+
+class MappedGraph:
+    def __init__(self, path: str):
+        self._views: List[memoryview] = []
+        self._mm = None
+        self._file = open(path, "rb")
+        try:
+            self._map()
+        except Exception:
+            self.close()
+            raise
+
+    def _map(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _HEADER.size:
+            raise ValueError("Неверный или неподдерживаемый формат файла.")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = self._view(memoryview(self._mm))
+        magic, version, flags, n, m, names_size = _HEADER.unpack_from(buf, 0)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError("Неверный или неподдерживаемый формат файла.")
+        self.undirected = bool(flags & 1)
+
+        # Каждая секция проверяется по своему концу: срез memoryview за границей
+        # файла молча укоротился бы, и обрезанный граф загрузился бы без ошибки.
+        pos = _HEADER.size
+        sections = []
+        for count, code in ((n, "q"), (n, "d"), (n, "d"), (n + 1, "q"), (n, "q"),
+                            (n + 1, "q"), (m, "q"), (m, "d")):
+            end = pos + count * 8
+            if end > size:
+                raise ValueError("Файл графа обрезан или повреждён.")
+            sections.append(self._view(buf[pos:end].cast(code)))
+            pos = end
+        (self.vids, self.xs, self.ys, self._name_offsets, self._name_order,
+         offsets, targets, weights) = sections
+        if pos + names_size > size:
+            raise ValueError("Файл графа обрезан или повреждён.")
+        self._names = self._view(buf[pos:pos + names_size])
+
+        self.csr = CSRGraph(self.undirected, self.vids, offsets, targets, weights,
+                            SortedIndex(self.vids))
+
+    def _view(self, view: memoryview) -> memoryview:
+        self._views.append(view)
+        return view
+
+    def close(self):
+        # Массивы csr — окна в отображение: после close() они освобождены, даже если
+        # на mg.csr ещё есть ссылки, иначе mmap не закрылся бы.
+        for attr in ("vids", "xs", "ys", "_name_offsets", "_name_order", "_names", "csr"):
+            self.__dict__.pop(attr, None)
+        while self._views:
+            self._views.pop().release()
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def __enter__(self) -> "MappedGraph":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.vids)
+
+    def _name_at(self, i: int) -> str:
+        return bytes(self._names[self._name_offsets[i]:self._name_offsets[i + 1]]).decode("utf-8")
+
+    def name(self, vid: int) -> str:
+        return self._name_at(self.csr.index[vid])
+
+    def position(self, vid: int) -> Tuple[float, float]:
+        i = self.csr.index[vid]
+        return self.xs[i], self.ys[i]
+
+    def vertex_id_by_name(self, name: str) -> Optional[int]:
+        target = name.encode("utf-8")
+        lo, hi = 0, len(self._name_order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            i = self._name_order[mid]
+            if bytes(self._names[self._name_offsets[i]:self._name_offsets[i + 1]]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._name_order):
+            i = self._name_order[lo]
+            if self._name_at(i) == name:
+                return self.vids[i]
+        return None
+
+    def to_graph(self) -> Tuple[Graph, Positions]:
+        graph = Graph(undirected=self.undirected)
+        positions: Positions = {}
+        for i, vid in enumerate(self.vids):
+            graph.add_vertex_explicit(vid, self._name_at(i))
+            positions[vid] = (self.xs[i], self.ys[i])
+        # Столбец источников разворачивается из offsets, рёбра добавляются одним
+        # пакетом; в неориентированном CSR каждое ребро записано дважды, "first"
+        # оставляет первое вхождение.
+        csr = self.csr
+        vids, offsets = self.vids, csr.offsets
+        src = array("q")
+        for i, vid in enumerate(vids):
+            src.extend(array("q", [vid]) * (offsets[i + 1] - offsets[i]))
+        dst = array("q", [vids[t] for t in csr.targets])
+        graph.add_edge_arrays(src, dst, csr.weights, duplicates="first")
+        return graph, positions
+
+
+def load_binary(path: str) -> Tuple[Graph, Positions]:
+    with MappedGraph(path) as mg:
+        return mg.to_graph()
+
+
+def load_any(path: str) -> Tuple[Graph, Positions]:
+    if is_binary_file(path):
+        return load_binary(path)
+    return load_json(path)
+
+
+def json_to_binary(src: str, dst: str):
+    graph, positions = load_json(src)
+    save_binary(dst, graph, positions)
+
+
+def binary_to_json(src: str, dst: str):
+    graph, positions = load_binary(src)
+    save_json(dst, graph, positions)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3:
+        sys.exit("Использование: python graph_io.py ИСТОЧНИК НАЗНАЧЕНИЕ")
+    if is_binary_file(sys.argv[1]):
+        binary_to_json(sys.argv[1], sys.argv[2])
+    else:
+        json_to_binary(sys.argv[1], sys.argv[2])
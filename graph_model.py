@@ -1,92 +1,595 @@
 # graph_model.py
-from dataclasses import dataclass
-from typing import Dict, Optional, List, Tuple
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple
+
+from pqueue import weight_stats
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+DUPLICATE_POLICIES = ("last", "first", "min", "sum")
+DENSE_GAP = 1024
+
+
+def _columns(src, dst, weight) -> Tuple[List[int], List[int], List[float]]:
+    if np is not None:
+        s = np.asarray(src, dtype=np.int64)
+        d = np.asarray(dst, dtype=np.int64)
+        w = np.asarray(weight, dtype=np.float64)
+        if not (s.shape == d.shape == w.shape) or s.ndim != 1:
+            raise ValueError("Массивы рёбер должны быть одной длины.")
+        if w.size and (w < 0).any():
+            raise ValueError("Вес не может быть отрицательным.")
+        return s.tolist(), d.tolist(), w.tolist()
+    s = list(map(int, src))
+    d = list(map(int, dst))
+    w = list(map(float, weight))
+    if not (len(s) == len(d) == len(w)):
+        raise ValueError("Массивы рёбер должны быть одной длины.")
+    if w and min(w) < 0:
+        raise ValueError("Вес не может быть отрицательным.")
+    return s, d, w
 
 
-@dataclass
 class Vertex:
-    vid: int
-    name: str
+    __slots__ = ("vid", "name")
+
+    def __init__(self, vid: int, name: str):
+        self.vid = vid
+        self.name = name
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Vertex):
+            return NotImplemented
+        return self.vid == other.vid and self.name == other.name
+
+    def __repr__(self) -> str:
+        return f"Vertex(vid={self.vid!r}, name={self.name!r})"
+
+
+class VertexTable(MutableMapping):
+    # Плотные vid хранятся без словаря: имя лежит в списке по индексу vid, None —
+    # пустое место. Vid далеко за концом списка (разреженные номера из импорта)
+    # уходят в словарь _sparse; после первого такого vid список больше не растёт,
+    # поэтому каждый vid живёт ровно в одном из двух мест.
+    def __init__(self):
+        self._names: List[Optional[str]] = []
+        self._sparse: Dict[int, str] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count + len(self._sparse)
+
+    def __iter__(self) -> Iterator[int]:
+        names = self._names
+        for vid in range(len(names)):
+            if names[vid] is not None:
+                yield vid
+        yield from self._sparse
+
+    def __contains__(self, vid) -> bool:
+        names = self._names
+        try:
+            if 0 <= vid < len(names):
+                return names[vid] is not None
+        except TypeError:
+            return False
+        return vid in self._sparse
+
+    def __getitem__(self, vid: int) -> Vertex:
+        return Vertex(vid, self.name(vid))
+
+    def __setitem__(self, vid: int, vertex: Vertex):
+        self.set(vid, vertex.name)
+
+    def __delitem__(self, vid: int):
+        names = self._names
+        if 0 <= vid < len(names):
+            if names[vid] is None:
+                raise KeyError(vid)
+            names[vid] = None
+            self._count -= 1
+        else:
+            del self._sparse[vid]
+
+    def set(self, vid: int, name: str):
+        names = self._names
+        n = len(names)
+        if 0 <= vid < n:
+            if names[vid] is None:
+                self._count += 1
+            names[vid] = name
+        elif not self._sparse and n <= vid <= 2 * n + DENSE_GAP:
+            if vid > n:
+                names.extend([None] * (vid - n))
+            names.append(name)
+            self._count += 1
+        else:
+            self._sparse[vid] = name
+
+    def name(self, vid: int) -> str:
+        names = self._names
+        if 0 <= vid < len(names):
+            name = names[vid]
+            if name is None:
+                raise KeyError(vid)
+            return name
+        return self._sparse[vid]
+
+    def values(self) -> Iterator[Vertex]:
+        return (Vertex(vid, name) for vid, name in self._pairs())
+
+    def items(self) -> Iterator[Tuple[int, Vertex]]:
+        return ((vid, Vertex(vid, name)) for vid, name in self._pairs())
+
+    def names(self) -> Iterator[str]:
+        return (name for _, name in self._pairs())
+
+    def _pairs(self) -> Iterator[Tuple[int, str]]:
+        for vid, name in enumerate(self._names):
+            if name is not None:
+                yield vid, name
+        yield from self._sparse.items()
+
+    def clear(self):
+        self._names = []
+        self._sparse.clear()
+        self._count = 0
+
+    def copy(self) -> "VertexTable":
+        table = VertexTable()
+        table._names = list(self._names)
+        table._sparse = dict(self._sparse)
+        table._count = self._count
+        return table
+
+
+class ConnectivityIndex:
+    # Слабые компоненты ведутся системой непересекающихся множеств, вставки
+    # объединяют множества сразу. Для ориентированного графа дополнительно хранится
+    # номер сильной компоненты в топологическом порядке конденсации: из u достижима v
+    # только если rank[u] <= rank[v]. Удаления лишь сокращают достижимость, поэтому
+    # старое разбиение остаётся верным для отказов «пути нет», только грубее: индекс
+    # помечается устаревшим, а полный пересчёт rebuild() делает фоновый поиск.
+    # Сам индекс никогда не строится: пока не вызван rebuild() (в библиотеке —
+    # явно, graph.connectivity.rebuild() после загрузки графа), он пуст и
+    # known_unreachable всегда отвечает False.
+    def __init__(self, graph: "GraphView"):
+        self.graph = graph
+        self._parent: Optional[Dict[int, int]] = None
+        self._rank: Optional[Dict[int, int]] = None
+        self._next_rank = 0
+        self._stale = False
+
+    def _find(self, v: int) -> int:
+        parent = self._parent
+        root = v
+        while parent[root] != root:
+            root = parent[root]
+        while parent[v] != root:
+            parent[v], v = root, parent[v]
+        return root
+
+    def _union(self, u: int, v: int):
+        ru, rv = self._find(u), self._find(v)
+        if ru != rv:
+            self._parent[ru] = rv
+
+    def _build_weak(self):
+        self._parent = {v: v for v in self.graph.vertices.keys()}
+        for u, nbrs in self.graph.adj.items():
+            for v in nbrs:
+                self._union(u, v)
+
+    def _build_strong(self):
+        # Итеративный Тарьян: компоненты выходят в обратном топологическом порядке.
+        adj = self.graph.adj
+        index: Dict[int, int] = {}
+        low: Dict[int, int] = {}
+        stack: List[int] = []
+        on_stack = set()
+        order: List[List[int]] = []
+        counter = 0
+        for root in self.graph.vertices.keys():
+            if root in index:
+                continue
+            work = [(root, iter(adj.get(root, ())))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                u, it = work[-1]
+                for v in it:
+                    if v not in index:
+                        index[v] = low[v] = counter
+                        counter += 1
+                        stack.append(v)
+                        on_stack.add(v)
+                        work.append((v, iter(adj.get(v, ()))))
+                        break
+                    if v in on_stack and index[v] < low[u]:
+                        low[u] = index[v]
+                else:
+                    work.pop()
+                    if work and low[u] < low[work[-1][0]]:
+                        low[work[-1][0]] = low[u]
+                    if low[u] == index[u]:
+                        comp = []
+                        while True:
+                            w = stack.pop()
+                            on_stack.discard(w)
+                            comp.append(w)
+                            if w == u:
+                                break
+                        order.append(comp)
+        n = len(order)
+        self._rank = {v: n - 1 - i for i, comp in enumerate(order) for v in comp}
+        self._next_rank = n
+
+    def rebuild(self):
+        self._build_weak()
+        if not self.graph.undirected:
+            self._build_strong()
+        self._stale = False
+
+    def adopt(self, other: "ConnectivityIndex"):
+        # Принимает индекс, пересчитанный по снимку той же версии графа.
+        self._parent, self._rank, self._next_rank = other._parent, other._rank, other._next_rank
+        self._stale = other.stale
+
+    def copy(self, graph: "GraphView") -> "ConnectivityIndex":
+        index = ConnectivityIndex(graph)
+        if self._parent is not None:
+            index._parent = dict(self._parent)
+        if self._rank is not None:
+            index._rank = dict(self._rank)
+        index._next_rank = self._next_rank
+        index._stale = self._stale
+        return index
+
+    def reset(self):
+        self._parent, self._rank, self._next_rank = {}, {}, 0
+        self._stale = False
+
+    @property
+    def built(self) -> bool:
+        return self._parent is not None
 
+    @property
+    def stale(self) -> bool:
+        return (self._stale or self._parent is None
+                or (not self.graph.undirected and self._rank is None))
 
-class Graph:
+    def add_vertex(self, vid: int):
+        if self._parent is not None:
+            self._parent.setdefault(vid, vid)
+        if self._rank is not None and vid not in self._rank:
+            self._rank[vid] = self._next_rank
+            self._next_rank += 1
+
+    def add_edge(self, u: int, v: int):
+        if self._parent is not None:
+            self._union(u, v)
+        rank = self._rank
+        if rank is not None and rank[u] > rank[v]:
+            self._rank = None
+
+    def add_edges(self, src: Iterable[int], dst: Iterable[int]):
+        for u, v in zip(src, dst):
+            self.add_edge(u, v)
+
+    def mark_stale(self):
+        self._stale = True
+
+    def known_unreachable(self, u: int, v: int) -> bool:
+        # Только то, что уже известно: никогда не запускает пересчёт.
+        parent = self._parent
+        if u == v or parent is None or u not in parent or v not in parent:
+            return False
+        if self._find(u) != self._find(v):
+            return True
+        rank = self._rank
+        return not self.graph.undirected and rank is not None and rank[u] > rank[v]
+
+
+class GraphView:
+    undirected: bool
+    vertices: VertexTable
+    adj: Dict[int, Dict[int, float]]
+    _radj: Dict[int, Dict[int, float]]
+    _name_to_vid: Dict[str, int]
+    version: int
+    _connectivity: Optional[ConnectivityIndex] = None
+    _weight_stats: Optional[Tuple[int, Tuple[bool, float]]] = None
+
+    @property
+    def connectivity(self) -> ConnectivityIndex:
+        if self._connectivity is None:
+            self._connectivity = ConnectivityIndex(self)
+        return self._connectivity
+
+    def weight_stats(self) -> Tuple[bool, float]:
+        # Целые ли веса и их максимум для очередей radix/dial; проход по всем рёбрам
+        # повторяется только после правок графа.
+        cached = self._weight_stats
+        if cached is None or cached[0] != self.version:
+            cached = self._weight_stats = (self.version, weight_stats(self.adj))
+        return cached[1]
+
+    def has_edge(self, u: int, v: int) -> bool:
+        return u in self.adj and v in self.adj[u]
+
+    @property
+    def radj(self) -> Dict[int, Dict[int, float]]:
+        return self.adj if self.undirected else self._radj
+
+    def in_degree(self, vid: int) -> int:
+        return len(self.radj.get(vid, {}))
+
+    def out_degree(self, vid: int) -> int:
+        return len(self.adj.get(vid, {}))
+
+    def predecessors(self, vid: int) -> List[int]:
+        return list(self.radj.get(vid, {}))
+
+    def vertex_id_by_name(self, name: str) -> Optional[int]:
+        return self._name_to_vid.get(name)
+
+
+class GraphSnapshot(GraphView):
+    # Неизменяемый срез графа на момент version. Внешние словари свои, а словари
+    # соседей общие с графом: Graph копирует строку перед первой записью в неё
+    # после снимка, поэтому снимок никогда не видит частично применённых правок.
+    def __init__(self, graph: "Graph"):
+        self.undirected = graph.undirected
+        self.vertices = graph.vertices.copy()
+        self.adj = dict(graph.adj)
+        self._radj = dict(graph._radj)
+        self._name_to_vid = dict(graph._name_to_vid)
+        self.version = graph.version
+        # Своя копия индекса связности: индекс графа меняется дальше вместе с ним.
+        if graph._connectivity is not None and graph._connectivity.built:
+            self._connectivity = graph._connectivity.copy(self)
+
+
+class Graph(GraphView):
     def __init__(self, undirected: bool = True):
         self.undirected = undirected
-        self.vertices: Dict[int, Vertex] = {}
+        self.vertices = VertexTable()
         self.adj: Dict[int, Dict[int, float]] = {}
+        self._radj: Dict[int, Dict[int, float]] = {}
         self._name_to_vid: Dict[str, int] = {}
         self._next_vid = 1
+        self.version = 0
+        self.published: Optional[GraphSnapshot] = None
+        self._generation = 0
+        self._owned: Dict[int, int] = {}
+        self._rowned: Dict[int, int] = {}
+
+    def _row(self, table: Dict[int, Dict[int, float]], owned: Dict[int, int],
+             u: int) -> Dict[int, float]:
+        nbrs = table.get(u)
+        if nbrs is None:
+            nbrs = table[u] = {}
+            # До первого снимка учёт не нужен: отсутствующая запись и так не равна
+            # номеру следующего поколения, и строка будет скопирована при записи.
+            if self._generation:
+                owned[u] = self._generation
+        elif self._generation and owned.get(u) != self._generation:
+            nbrs = table[u] = dict(nbrs)
+            owned[u] = self._generation
+        return nbrs
+
+    def _reverse_tables(self) -> Tuple[Dict[int, Dict[int, float]], Dict[int, int]]:
+        if self.undirected:
+            return self.adj, self._owned
+        return self._radj, self._rowned
+
+    def snapshot(self) -> GraphSnapshot:
+        # Только для потока-писателя: снимок копирует внешние словари в несколько
+        # шагов и сдвигает поколение, поэтому, вызванный посреди правки (между
+        # adj[u][v] и adj[v][u]), он увидел бы её половину. Читатели берут
+        # готовый снимок из published.
+        snap = self.published
+        if snap is None or snap.version != self.version:
+            snap = GraphSnapshot(self)
+            self._generation += 1
+        return snap
+
+    def publish(self) -> GraphSnapshot:
+        # Писатель вызывает после пакета правок; до следующего вызова читатели
+        # видят в published одну и ту же согласованную версию.
+        self.published = self.snapshot()
+        return self.published
 
     def add_vertex(self, name: Optional[str] = None) -> int:
         vid = self._next_vid
         self._next_vid += 1
         if name is None:
             name = f"V{vid}"
-        self.vertices[vid] = Vertex(vid=vid, name=name)
-        self._name_to_vid[name] = vid
-        self.adj.setdefault(vid, {})
+        self.vertices.set(vid, name)
+        self._name_to_vid[self.vertices.name(vid)] = vid
+        self._row(self.adj, self._owned, vid)
+        if self._connectivity is not None:
+            self._connectivity.add_vertex(vid)
+        self.version += 1
         return vid
 
     def add_vertex_explicit(self, vid: int, name: str):
-        self.vertices[vid] = Vertex(vid=vid, name=name)
-        self._name_to_vid[name] = vid
-        self.adj.setdefault(vid, {})
+        self.vertices.set(vid, name)
+        self._name_to_vid[self.vertices.name(vid)] = vid
+        if vid not in self.adj:
+            self._row(self.adj, self._owned, vid)
+            if self._connectivity is not None:
+                self._connectivity.add_vertex(vid)
         if vid >= self._next_vid:
             self._next_vid = vid + 1
+        self.version += 1
 
     def add_edge(self, u: int, v: int, w: float):
         if u not in self.vertices or v not in self.vertices:
             raise ValueError("Вершина не существует.")
         if w < 0:
             raise ValueError("Вес не может быть отрицательным.")
-        self.adj.setdefault(u, {})[v] = w
+        self._row(self.adj, self._owned, u)[v] = w
         if self.undirected:
-            self.adj.setdefault(v, {})[u] = w
+            self._row(self.adj, self._owned, v)[u] = w
+        else:
+            self._row(self._radj, self._rowned, v)[u] = w
+        if self._connectivity is not None:
+            self._connectivity.add_edge(u, v)
+        self.version += 1
 
-    def has_edge(self, u: int, v: int) -> bool:
-        return u in self.adj and v in self.adj[u]
+    @classmethod
+    def from_arrays(cls, src, dst, weight, undirected: bool = True,
+                    names: Optional[Dict[int, str]] = None,
+                    duplicates: str = "last") -> "Graph":
+        src, dst, weight = _columns(src, dst, weight)
+        graph = cls(undirected=undirected)
+        for vid in sorted(set(src) | set(dst)):
+            graph.add_vertex_explicit(vid, names.get(vid, str(vid)) if names else str(vid))
+        graph._fill_edges(src, dst, weight, duplicates)
+        return graph
 
-    def vertex_id_by_name(self, name: str) -> Optional[int]:
-        return self._name_to_vid.get(name)
+    def add_edges_from(self, edges: Iterable[Tuple[int, int, float]], duplicates: str = "last"):
+        edges = list(edges)
+        if not edges:
+            return
+        src, dst, weight = zip(*edges)
+        self.add_edge_arrays(src, dst, weight, duplicates)
+
+    def add_edge_arrays(self, src, dst, weight, duplicates: str = "last"):
+        src, dst, weight = _columns(src, dst, weight)
+        if src and not self.vertices.keys() >= set(src) | set(dst):
+            raise ValueError("Вершина не существует.")
+        self._fill_edges(src, dst, weight, duplicates)
+
+    def _fill_edges(self, src: List[int], dst: List[int], weight: List[float], duplicates: str):
+        if duplicates not in DUPLICATE_POLICIES:
+            raise ValueError(f"Неизвестная политика дубликатов: {duplicates}")
+        if not src:
+            return
+        adj = self.adj
+        undirected = self.undirected
+        if duplicates == "last":
+            self._own_rows(src, dst if undirected else ())
+            for u, v, w in zip(src, dst, weight):
+                adj[u][v] = w
+                if undirected:
+                    adj[v][u] = w
+        elif duplicates == "first":
+            self._own_rows(src, dst if undirected else ())
+            for u, v, w in zip(src, dst, weight):
+                nbrs = adj[u]
+                if v not in nbrs:
+                    nbrs[v] = w
+                    if undirected:
+                        adj[v][u] = w
+        elif duplicates == "min":
+            self._own_rows(src, dst if undirected else ())
+            for u, v, w in zip(src, dst, weight):
+                nbrs = adj[u]
+                if v not in nbrs or w < nbrs[v]:
+                    nbrs[v] = w
+                    if undirected:
+                        adj[v][u] = w
+        else:
+            self._own_rows(src, dst if undirected else ())
+            for u, v, w in zip(src, dst, weight):
+                total = adj[u].get(v, 0.0) + w
+                adj[u][v] = total
+                if undirected:
+                    adj[v][u] = total
+        if not undirected:
+            radj, rowned = self._radj, self._rowned
+            for v in set(dst):
+                self._row(radj, rowned, v)
+            # Обратные строки берут итоговый вес из adj: он уже учитывает политику дубликатов.
+            for u, v in zip(src, dst):
+                radj[v][u] = adj[u][v]
+        if self._connectivity is not None:
+            self._connectivity.add_edges(src, dst)
+        self.version += 1
+
+    def _own_rows(self, *columns: Iterable[int]):
+        if not self._generation:
+            return
+        adj, owned = self.adj, self._owned
+        for u in set().union(*columns):
+            self._row(adj, owned, u)
 
     def update_edge_weight(self, u: int, v: int, w: float):
         if w < 0:
             raise ValueError("Вес не может быть отрицательным.")
         if not self.has_edge(u, v):
             raise ValueError("Ребра не существует.")
-        self.adj[u][v] = w
+        self._row(self.adj, self._owned, u)[v] = w
         if self.undirected:
-            self.adj[v][u] = w
+            self._row(self.adj, self._owned, v)[u] = w
+        else:
+            self._row(self._radj, self._rowned, v)[u] = w
+        self.version += 1
 
     def remove_edge(self, u: int, v: int):
         if self.has_edge(u, v):
-            del self.adj[u][v]
+            if self._connectivity is not None:
+                self._connectivity.mark_stale()
+            del self._row(self.adj, self._owned, u)[v]
+            if not self.undirected:
+                del self._row(self._radj, self._rowned, v)[u]
         if self.undirected and v in self.adj and u in self.adj[v]:
-            del self.adj[v][u]
+            del self._row(self.adj, self._owned, v)[u]
+        self.version += 1
 
     def remove_vertex(self, vid: int) -> List[Tuple[int, int]]:
-        if vid not in self.vertices:
+        return self.remove_vertices((vid,))
+
+    def remove_vertices(self, vids: Iterable[int]) -> List[Tuple[int, int]]:
+        doomed = [vid for vid in dict.fromkeys(vids) if vid in self.vertices]
+        if not doomed:
             return []
-        name = self.vertices[vid].name
-        self._name_to_vid.pop(name, None)
+        gone = set(doomed)
+        adj, owned = self.adj, self._owned
+        radj, rowned = self._reverse_tables()
 
         removed_edges: List[Tuple[int, int]] = []
-        for v in list(self.adj.get(vid, {}).keys()):
-            removed_edges.append((vid, v))
-            if self.undirected:
-                self.adj[v].pop(vid, None)
-        self.adj.pop(vid, None)
-
-        for u in list(self.adj.keys()):
-            if vid in self.adj[u]:
-                removed_edges.append((u, vid))
-                self.adj[u].pop(vid, None)
-
-        del self.vertices[vid]
+        done = set()
+        for vid in doomed:
+            self._name_to_vid.pop(self.vertices.name(vid), None)
+            for v in adj.pop(vid, {}):
+                if self.undirected and v in done:
+                    continue
+                removed_edges.append((vid, v))
+                if v not in gone:
+                    self._row(radj, rowned, v).pop(vid, None)
+            if not self.undirected:
+                for u in self._radj.pop(vid, {}):
+                    if u in gone:
+                        continue
+                    removed_edges.append((u, vid))
+                    self._row(adj, owned, u).pop(vid, None)
+            owned.pop(vid, None)
+            self._rowned.pop(vid, None)
+            done.add(vid)
+            del self.vertices[vid]
+
+        if self._connectivity is not None:
+            self._connectivity.mark_stale()
+        self.version += 1
         return removed_edges
 
     def clear(self):
         self.vertices.clear()
         self.adj.clear()
+        self._radj.clear()
+        self._owned.clear()
+        self._rowned.clear()
         self._name_to_vid.clear()
         self._next_vid = 1
+        if self._connectivity is not None:
+            self._connectivity.reset()
+        self.version += 1
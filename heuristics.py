@@ -0,0 +1,73 @@
+# heuristics.py
+import math
+import warnings
+from typing import Callable, Dict, List, Tuple
+
+Point = Tuple[float, float]
+Heuristic = Callable[[int, int], float]
+
+
+def euclidean(p: Point, q: Point) -> float:
+    return math.hypot(p[0] - q[0], p[1] - q[1])
+
+
+def manhattan(p: Point, q: Point) -> float:
+    return abs(p[0] - q[0]) + abs(p[1] - q[1])
+
+
+METRICS: Dict[str, Callable[[Point, Point], float]] = {
+    "euclidean": euclidean,
+    "manhattan": manhattan,
+}
+
+
+def zero_heuristic(v: int, goal: int) -> float:
+    return 0.0
+
+
+def positional_heuristic(positions: Dict[int, Point],
+                         metric: str = "euclidean",
+                         scale: float = 1.0) -> Heuristic:
+    dist = METRICS[metric]
+
+    def h(v: int, goal: int) -> float:
+        pv = positions.get(v)
+        pg = positions.get(goal)
+        if pv is None or pg is None:
+            return 0.0
+        return scale * dist(pv, pg)
+
+    return h
+
+
+def check_geometric_weights(adj: Dict[int, Dict[int, float]],
+                            positions: Dict[int, Point],
+                            metric: str = "euclidean",
+                            scale: float = 1.0,
+                            eps: float = 1e-9) -> List[Tuple[int, int, float, float]]:
+    dist = METRICS[metric]
+    bad = []
+    for u, nbrs in adj.items():
+        pu = positions.get(u)
+        if pu is None:
+            continue
+        for v, w in nbrs.items():
+            pv = positions.get(v)
+            if pv is None:
+                continue
+            geo = scale * dist(pu, pv)
+            if w + eps < geo:
+                bad.append((u, v, w, geo))
+    return bad
+
+
+def warn_if_inadmissible(adj: Dict[int, Dict[int, float]],
+                         positions: Dict[int, Point],
+                         metric: str = "euclidean",
+                         scale: float = 1.0) -> List[Tuple[int, int, float, float]]:
+    bad = check_geometric_weights(adj, positions, metric, scale)
+    if bad:
+        warnings.warn(
+            f"Эвристика {metric} недопустима: у {len(bad)} рёбер вес меньше расстояния на плоскости.",
+            RuntimeWarning, stacklevel=2)
+    return bad
@@ -0,0 +1,230 @@
+# importers.py
+import json
+import os
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from graph_model import Graph
+from graph_io import JSON_FORMAT, Positions
+
+BATCH_SIZE = 65536
+CHUNK_SIZE = 1 << 16
+
+
+class _JsonReader:
+    def __init__(self, f: TextIO, chunk_size: int = CHUNK_SIZE):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._f.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            buf, pos = self._buf, self._pos
+            n = len(buf)
+            while pos < n and buf[pos] in " \t\r\n":
+                pos += 1
+            self._pos = pos
+            if pos < n:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def take(self) -> str:
+        ch = self.peek()
+        self._pos += 1
+        return ch
+
+    def expect(self, ch: str):
+        if self.peek() != ch:
+            raise ValueError(f"Ошибка разбора JSON: ожидался символ {ch!r}.")
+        self._pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+    def items(self) -> Iterator:
+        self.expect("[")
+        if self.peek() == "]":
+            self.take()
+            return
+        while True:
+            yield self.value()
+            ch = self.take()
+            if ch == "]":
+                return
+            if ch != ",":
+                raise ValueError("Ошибка разбора JSON: ожидался ',' или ']'.")
+
+
+def iter_tk_v1(f: TextIO) -> Iterator[Tuple[str, object]]:
+    reader = _JsonReader(f)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "vertices" and reader.peek() == "[":
+            for item in reader.items():
+                yield "vertex", item
+            yield "end", key
+        elif key == "edges" and reader.peek() == "[":
+            for item in reader.items():
+                yield "edge", item
+            yield "end", key
+        else:
+            yield "meta", (key, reader.value())
+        ch = reader.take()
+        if ch == "}":
+            return
+        if ch != ",":
+            raise ValueError("Ошибка разбора JSON: ожидался ',' или '}'.")
+
+
+def import_tk_v1(f: TextIO, batch_size: int = BATCH_SIZE) -> Tuple[Graph, Positions]:
+    # Повторное ребро не меняет уже прочитанное, как в graph_from_dict:
+    # оба загрузчика формата дают один и тот же граф.
+    graph = Graph(undirected=True)
+    positions: Positions = {}
+    seen_format = False
+    seen_undirected = False
+    seen_vertices = False
+    pending: List[Tuple[int, int, float]] = []
+    batch: List[Tuple[int, int, float]] = []
+
+    for kind, item in iter_tk_v1(f):
+        if kind == "vertex":
+            vid = int(item["vid"])
+            graph.add_vertex_explicit(vid, str(item["name"]))
+            positions[vid] = (float(item.get("x", 0)), float(item.get("y", 0)))
+        elif kind == "edge":
+            edge = (int(item["u"]), int(item["v"]), float(item["w"]))
+            if not (seen_vertices and seen_undirected):
+                pending.append(edge)
+                continue
+            if pending:
+                graph.add_edges_from(pending, "first")
+                pending = []
+            batch.append(edge)
+            if len(batch) >= batch_size:
+                graph.add_edges_from(batch, "first")
+                batch = []
+        elif kind == "end":
+            if item == "vertices":
+                seen_vertices = True
+        else:
+            key, value = item
+            if key == "format":
+                if value != JSON_FORMAT:
+                    raise ValueError("Неверный или неподдерживаемый формат файла.")
+                seen_format = True
+            elif key == "undirected":
+                graph.undirected = bool(value)
+                seen_undirected = True
+
+    if not seen_format:
+        raise ValueError("Неверный или неподдерживаемый формат файла.")
+    graph.add_edges_from(pending, "first")
+    graph.add_edges_from(batch, "first")
+    return graph, positions
+
+
+def import_edge_list(f: TextIO, undirected: bool = True,
+                     batch_size: int = BATCH_SIZE) -> Graph:
+    graph = Graph(undirected=undirected)
+    name_to_vid: Dict[str, int] = {}
+    batch: List[Tuple[int, int, float]] = []
+    first = True
+
+    for line in f:
+        line = line.strip()
+        if not line or line[0] in "#%":
+            continue
+        parts = line.replace(",", " ").replace(";", " ").split()
+        if len(parts) < 2:
+            continue
+        try:
+            w = float(parts[2]) if len(parts) > 2 else 1.0
+        except ValueError:
+            if first:
+                first = False
+                continue
+            raise ValueError(f"Неверный вес ребра: {parts[2]}")
+        first = False
+
+        ends = []
+        for name in parts[:2]:
+            vid = name_to_vid.get(name)
+            if vid is None:
+                vid = graph.add_vertex(name)
+                name_to_vid[name] = vid
+            ends.append(vid)
+        batch.append((ends[0], ends[1], w))
+        if len(batch) >= batch_size:
+            graph.add_edges_from(batch)
+            batch = []
+
+    graph.add_edges_from(batch)
+    return graph
+
+
+def import_dimacs(f: TextIO, batch_size: int = BATCH_SIZE) -> Graph:
+    graph = Graph(undirected=False)
+    batch: List[Tuple[int, int, float]] = []
+
+    for line in f:
+        if not line or line[0] == "c":
+            continue
+        if line[0] == "a":
+            _, u, v, w = line.split()
+            batch.append((int(u), int(v), float(w)))
+            if len(batch) >= batch_size:
+                graph.add_edges_from(batch)
+                batch = []
+        elif line[0] == "p":
+            parts = line.split()
+            n = int(parts[2])
+            for vid in range(1, n + 1):
+                graph.add_vertex_explicit(vid, str(vid))
+
+    graph.add_edges_from(batch)
+    return graph
+
+
+def import_file(path: str, fmt: Optional[str] = None,
+                undirected: bool = True) -> Tuple[Graph, Positions]:
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lower()
+        fmt = {".json": "json", ".gr": "dimacs"}.get(ext, "edges")
+    with open(path, "r", encoding="utf-8") as f:
+        if fmt == "json":
+            return import_tk_v1(f)
+        if fmt == "dimacs":
+            return import_dimacs(f), {}
+        if fmt == "edges":
+            return import_edge_list(f, undirected), {}
+    raise ValueError(f"Неизвестный формат импорта: {fmt}")
@@ -0,0 +1,81 @@
+# matrix.py
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+from csr_graph import CSRGraph
+from dijkstra import csr_distances
+
+_worker_csr: Optional[CSRGraph] = None
+
+
+class DistanceMatrix:
+    def __init__(self, sources: Sequence[int], targets: Sequence[int], data: array):
+        self.sources = list(sources)
+        self.targets = list(targets)
+        self.data = data
+        self._row = {vid: i for i, vid in enumerate(self.sources)}
+        self._col = {vid: j for j, vid in enumerate(self.targets)}
+
+    @property
+    def shape(self):
+        return len(self.sources), len(self.targets)
+
+    def __getitem__(self, key) -> float:
+        s, t = key
+        return self.data[self._row[s] * len(self.targets) + self._col[t]]
+
+    def row(self, source: int) -> List[float]:
+        i = self._row[source] * len(self.targets)
+        return list(self.data[i:i + len(self.targets)])
+
+    def tolist(self) -> List[List[float]]:
+        m = len(self.targets)
+        return [list(self.data[i * m:(i + 1) * m]) for i in range(len(self.sources))]
+
+    def to_numpy(self):
+        import numpy as np
+        return np.frombuffer(self.data, dtype=np.float64).reshape(self.shape)
+
+
+def _init_worker(csr_state):
+    global _worker_csr
+    undirected, vids, offsets, targets, weights = csr_state
+    _worker_csr = CSRGraph(undirected, vids, offsets, targets, weights)
+
+
+def _solve_rows(sources: List[int], targets: List[int]) -> array:
+    out = array("d")
+    for s in sources:
+        out.extend(csr_distances(_worker_csr, s, targets))
+    return out
+
+
+def distance_matrix(graph, sources: Sequence[int], targets: Sequence[int],
+                    workers: Optional[int] = None,
+                    chunk_size: Optional[int] = None) -> DistanceMatrix:
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+    sources = list(sources)
+    targets = list(targets)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(sources)))
+
+    if workers == 1:
+        data = array("d")
+        for s in sources:
+            data.extend(csr_distances(csr, s, targets))
+        return DistanceMatrix(sources, targets, data)
+
+    if chunk_size is None:
+        chunk_size = max(1, len(sources) // (workers * 4))
+    chunks = [sources[i:i + chunk_size] for i in range(0, len(sources), chunk_size)]
+    state = (csr.undirected, csr.vids, csr.offsets, csr.targets, csr.weights)
+
+    data = array("d")
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(state,)) as pool:
+        for part in pool.map(_solve_rows, chunks, [targets] * len(chunks)):
+            data.extend(part)
+    return DistanceMatrix(sources, targets, data)
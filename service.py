@@ -0,0 +1,280 @@
+# service.py
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from dijkstra import shortest_path_tree
+from graph_io import is_binary_file, load_binary
+from importers import import_file
+
+MAX_BODY = 64 * 1024 * 1024
+
+_graph = None
+
+
+def load_graph(path: str):
+    if is_binary_file(path):
+        graph, _ = load_binary(path)
+    else:
+        graph, _ = import_file(path)
+    return graph
+
+
+def _init_worker(path: str):
+    global _graph
+    _graph = load_graph(path)
+    # Граф сервиса не меняется: индекс связности строится один раз при загрузке.
+    _graph.connectivity.rebuild()
+
+
+def _is_ref(ref) -> bool:
+    return isinstance(ref, (int, str)) and not isinstance(ref, bool)
+
+
+def _resolve(graph, ref) -> Optional[int]:
+    if isinstance(ref, int) and ref in graph.vertices:
+        return ref
+    return graph.vertex_id_by_name(str(ref))
+
+
+def solve_queries(graph, queries: List[Tuple[object, object]]) -> List[dict]:
+    results: List[Optional[dict]] = [None] * len(queries)
+    by_source: Dict[int, List[Tuple[int, int]]] = {}
+    for i, (start, goal) in enumerate(queries):
+        s, t = _resolve(graph, start), _resolve(graph, goal)
+        if s is None or t is None:
+            results[i] = {"error": "Вершина не найдена."}
+            continue
+        if graph.connectivity.known_unreachable(s, t):
+            results[i] = {"dist": None, "path": None}
+            continue
+        by_source.setdefault(s, []).append((i, t))
+
+    for s, wanted in by_source.items():
+        tree = shortest_path_tree(graph.adj, s, targets=[t for _, t in wanted])
+        for i, t in wanted:
+            path = tree.path_to(t)
+            results[i] = {
+                "dist": tree.distance(t) if path is not None else None,
+                "path": [graph.vertices.name(v) for v in path] if path is not None else None,
+            }
+    return results
+
+
+def _worker_ready() -> int:
+    return len(_graph.vertices)
+
+
+def _solve_in_worker(queries: List[Tuple[object, object]]) -> List[dict]:
+    return solve_queries(_graph, queries)
+
+
+class LatencyStats:
+    def __init__(self, window: int = 10000):
+        self.samples = deque(maxlen=window)
+        self.requests = 0
+        self.queries = 0
+        self.started = time.perf_counter()
+
+    def record(self, seconds: float, queries: int):
+        self.samples.append(seconds)
+        self.requests += 1
+        self.queries += queries
+
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        data = sorted(self.samples)
+        k = min(len(data) - 1, int(round(p / 100.0 * (len(data) - 1))))
+        return data[k]
+
+    def as_dict(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "requests": self.requests,
+            "queries": self.queries,
+            "uptime_s": elapsed,
+            "throughput_qps": self.queries / elapsed if elapsed > 0 else 0.0,
+            "latency_ms": {f"p{p}": self.percentile(p) * 1e3 for p in (50, 90, 99)},
+        }
+
+
+class QueryService:
+    def __init__(self, path: str, workers: int = 0,
+                 batch_window: float = 0.002, max_batch: int = 256):
+        self.path = path
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.stats = LatencyStats()
+        self._pending: List[Tuple[Tuple[object, object], asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # Цикл событий хранит на задачи только слабые ссылки: без этого множества
+        # задача пакета могла бы быть собрана сборщиком мусора посреди работы.
+        self._tasks: Set[asyncio.Task] = set()
+        if workers > 0:
+            self.executor: Executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(path,))
+            # Процессы запускаются сразу, до открытия сокетов, иначе дочерние
+            # процессы унаследуют клиентские соединения и те не закроются.
+            for f in [self.executor.submit(_worker_ready) for _ in range(workers)]:
+                f.result()
+        else:
+            _init_worker(path)
+            self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def solve(self, queries: List[Tuple[object, object]]) -> List[dict]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, _solve_in_worker, queries)
+
+    async def solve_one(self, start, goal) -> dict:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append(((start, goal), fut))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await fut
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch):
+        try:
+            results = await self.solve([q for q, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for (_, fut), result in zip(batch, results):
+            if not fut.done():
+                fut.set_result(result)
+
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, dict]:
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if method == "GET" and path == "/stats":
+            return 200, self.stats.as_dict()
+        if method != "POST" or path not in ("/query", "/batch"):
+            return 404, {"error": "Не найдено."}
+
+        try:
+            data = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "Некорректный JSON."}
+        if not isinstance(data, dict):
+            return 400, {"error": "Ожидался JSON-объект."}
+
+        t0 = time.perf_counter()
+        if path == "/query":
+            if "start" not in data or "goal" not in data:
+                return 400, {"error": "Нужны поля start и goal."}
+            if not _is_ref(data["start"]) or not _is_ref(data["goal"]):
+                return 400, {"error": "start и goal — имя или номер вершины."}
+            result = await self.solve_one(data["start"], data["goal"])
+            self.stats.record(time.perf_counter() - t0, 1)
+            return (404 if "error" in result else 200), result
+
+        queries = data.get("queries", [])
+        if not isinstance(queries, list) or not all(
+                isinstance(q, list) and len(q) == 2 and _is_ref(q[0]) and _is_ref(q[1])
+                for q in queries):
+            return 400, {"error": "Каждый запрос — пара [start, goal]."}
+        queries = [tuple(q) for q in queries]
+        results = await self.solve(queries) if queries else []
+        self.stats.record(time.perf_counter() - t0, len(queries))
+        return 200, {"results": results}
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large",
+            500: "Internal Server Error"}
+
+
+async def _handle_connection(service: QueryService, reader: asyncio.StreamReader,
+                             writer: asyncio.StreamWriter):
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            try:
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+            except ValueError:
+                break
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                key, _, value = line.decode("latin-1").partition(":")
+                headers[key.strip().lower()] = value.strip()
+
+            try:
+                length = int(headers.get("content-length", "0") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                status, payload = 400, {"error": "Некорректный Content-Length."}
+            elif length > MAX_BODY:
+                status, payload = 413, {"error": "Слишком большой запрос."}
+            else:
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    status, payload = await service.handle(method.upper(), target.split("?", 1)[0], body)
+                except Exception as e:
+                    # Ошибка обработчика — ответ 500, а не оборванное соединение.
+                    status, payload = 500, {"error": f"Внутренняя ошибка сервера: {e}"}
+
+            out = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            keep_alive = headers.get("connection", "").lower() != "close"
+            writer.write(
+                f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(out)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + out)
+            await writer.drain()
+            if not keep_alive or length < 0 or length > MAX_BODY:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(path: str, host: str = "127.0.0.1", port: int = 8765,
+                unix_socket: Optional[str] = None, workers: int = 0,
+                batch_window: float = 0.002, max_batch: int = 256):
+    service = QueryService(path, workers, batch_window, max_batch)
+
+    async def on_client(reader, writer):
+        await _handle_connection(service, reader, writer)
+
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        server = await asyncio.start_unix_server(on_client, path=unix_socket)
+        where = unix_socket
+    else:
+        server = await asyncio.start_server(on_client, host, port)
+        where = f"http://{host}:{server.sockets[0].getsockname()[1]}"
+    print(f"Граф {path} загружен; сервис слушает {where}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
@@ -0,0 +1,78 @@
+# stats.py
+import time
+from typing import Callable, Dict, Optional
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+class SearchStats:
+    __slots__ = ("settled", "relaxations", "pushes", "pops", "stale_pops", "max_queue",
+                 "radius", "phases", "hook", "progress_every", "_next_progress", "_phase", "_t0")
+
+    def __init__(self, hook: Optional[Callable[[str, "SearchStats"], None]] = None,
+                 progress_every: int = 1024):
+        self.hook = hook
+        self.progress_every = progress_every
+        self.reset()
+
+    def reset(self):
+        self.settled = 0
+        self.relaxations = 0
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.max_queue = 0
+        self.radius = 0.0
+        self._next_progress = self.progress_every
+        self.phases: Dict[str, float] = {}
+        self._phase: Optional[str] = None
+        self._t0 = 0.0
+
+    def phase(self, name: str):
+        now = time.perf_counter()
+        if self._phase is not None:
+            self.phases[self._phase] = self.phases.get(self._phase, 0.0) + now - self._t0
+        self._phase = name
+        self._t0 = now
+        if self.hook is not None:
+            self.hook(name, self)
+
+    def finish(self):
+        self.phase("done")
+        self._phase = None
+
+    def tick(self, radius: float):
+        # Прогресс измеряется работой — закреплёнными вершинами и релаксациями,
+        # чтобы отчёты шли и там, где на одну вершину приходится много рёбер.
+        work = self.settled + self.relaxations
+        if work >= self._next_progress:
+            self._next_progress = work + self.progress_every
+            self.progress(radius)
+
+    def progress(self, radius: float = 0.0):
+        self.radius = radius
+        if self.hook is not None:
+            self.hook("progress", self)
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.phases.values())
+
+    def as_dict(self) -> dict:
+        return {
+            "settled": self.settled,
+            "relaxations": self.relaxations,
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "stale_pops": self.stale_pops,
+            "max_queue": self.max_queue,
+            "phases": dict(self.phases),
+        }
+
+    def __str__(self) -> str:
+        return (f"вершин: {self.settled}, релаксаций: {self.relaxations}, "
+                f"в очередь: {self.pushes}, из очереди: {self.pops} "
+                f"(устаревших {self.stale_pops}), макс. очередь: {self.max_queue}, "
+                f"время: {self.total_time * 1e3:.2f} мс")
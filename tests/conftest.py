@@ -0,0 +1,29 @@
+# conftest.py
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from graph_model import Graph  # noqa: E402
+
+
+def random_graph(n: int, m: int, seed: int = 0, undirected: bool = True,
+                 zero_share: float = 0.0) -> Graph:
+    rng = random.Random(seed)
+    g = Graph(undirected=undirected)
+    vids = [g.add_vertex() for _ in range(n)]
+    for _ in range(m):
+        u, v = rng.choice(vids), rng.choice(vids)
+        if u == v:
+            continue
+        w = 0.0 if rng.random() < zero_share else round(rng.uniform(1.0, 10.0), 3)
+        g.add_edge(u, v, w)
+    return g
+
+
+@pytest.fixture
+def make_graph():
+    return random_graph
@@ -0,0 +1,59 @@
+# test_alt.py
+import pytest
+
+from alt import Landmarks, build_landmarks, landmarks_path, load_or_build
+from dijkstra import shortest_path_tree
+from graph_model import Graph
+
+
+def _check_queries(g, landmarks):
+    vids = list(g.vertices)
+    for s in vids[::3]:
+        tree = shortest_path_tree(g.adj, s)
+        for t in vids[::4]:
+            d, path = landmarks.query(g.adj, s, t)
+            assert (path is None) == (t not in tree)
+            if path is not None:
+                assert d == pytest.approx(tree.distance(t))
+                assert landmarks.lower_bound(s, t) <= tree.distance(t) + 1e-9
+
+
+@pytest.mark.parametrize("undirected", [True, False])
+@pytest.mark.parametrize("strategy", ["avoid", "farthest"])
+def test_alt_matches_dijkstra(make_graph, undirected, strategy):
+    for seed in range(4):
+        g = make_graph(60, 150, seed, undirected, zero_share=0.2)
+        _check_queries(g, build_landmarks(g, 6, strategy, seed))
+
+
+def test_avoid_with_zero_weight_tree_edges():
+    g = Graph(undirected=True)
+    a, b, c, d = (g.add_vertex(x) for x in "abcd")
+    g.add_edge(a, b, 0.0)
+    g.add_edge(b, c, 0.0)
+    g.add_edge(c, d, 2.0)
+    landmarks = build_landmarks(g, 3, "avoid", seed=1)
+    _check_queries(g, landmarks)
+
+
+def test_save_load_roundtrip(tmp_path, make_graph):
+    g = make_graph(40, 100, 3, undirected=False)
+    path = str(tmp_path / "g.djkb")
+    built = load_or_build(g, path)
+    loaded = Landmarks.load(landmarks_path(path), g)
+    assert loaded is not None
+    assert loaded.landmarks == built.landmarks
+    assert list(loaded.forward[0]) == list(built.forward[0])
+    g.add_edge(next(iter(g.vertices)), g.add_vertex(), 1.0)
+    assert Landmarks.load(landmarks_path(path), g) is None
+
+
+def test_version_match_needs_the_same_graph(make_graph):
+    g, other = make_graph(30, 60, 2), make_graph(30, 60, 2)
+    u = next(iter(g.adj))
+    v = next(iter(g.adj[u]))
+    g.update_edge_weight(u, v, 1.0)
+    other.update_edge_weight(u, v, 2.0)
+    landmarks = build_landmarks(g, 3)
+    assert g.version == other.version
+    assert landmarks.matches(g) and not landmarks.matches(other)
@@ -0,0 +1,29 @@
+# test_cache.py
+from cache import QueryCache
+from dijkstra import shortest_path
+
+
+def test_cache_hits_and_invalidates_on_edit(make_graph):
+    g = make_graph(40, 90, 6)
+    cache = QueryCache(maxsize=8)
+    vids = list(g.vertices)
+    s, t = vids[0], vids[-1]
+    first = cache.shortest_path(g, s, t)
+    assert first == shortest_path(g, s, t)
+    assert cache.shortest_path(g, s, t) == first and cache.hits == 1
+    g.add_edge(s, t, 0.001)
+    assert cache.shortest_path(g, s, t) == (0.001, [s, t])
+    assert cache.misses == 2
+
+
+def test_cache_bounds(make_graph):
+    g = make_graph(40, 90, 7)
+    vids = list(g.vertices)
+    cache = QueryCache(maxsize=5)
+    for t in vids[:20]:
+        cache.shortest_path(g, vids[0], t)
+    assert len(cache) == 5
+    tiny = QueryCache(max_bytes=200)
+    for t in vids[:20]:
+        tiny.shortest_path(g, vids[0], t)
+    assert tiny.nbytes <= 200
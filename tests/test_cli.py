@@ -0,0 +1,51 @@
+# test_cli.py
+import csv
+import io
+import json
+
+import pytest
+
+from cli import chunked, read_pairs, solve_chunks, write_results
+from dijkstra import shortest_path
+from graph_io import save_binary
+
+
+def test_read_pairs_and_chunked():
+    src = io.StringIO("# пары\na b\n\n  c   d  \nx;y\n")
+    assert list(read_pairs(io.StringIO("a;b\nc ; d\n"), ";")) == [("a", "b"), ("c", "d")]
+    with pytest.raises(ValueError):
+        list(read_pairs(src))
+    assert [len(c) for c in chunked(iter(range(7)), 3)] == [3, 3, 1]
+    assert list(chunked([], 3)) == []
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_workers_match_in_process_output(tmp_path, make_graph, fmt):
+    g = make_graph(40, 70, 3)
+    path = str(tmp_path / "g.djkb")
+    save_binary(path, g, {})
+    names = [g.vertices.name(v) for v in g.vertices]
+    pairs = [(names[i % 40], names[(i * 7) % 40]) for i in range(50)] + [("V1", "nosuch")]
+
+    outputs = []
+    for workers in (0, 2):
+        out = io.StringIO()
+        count = write_results(out, solve_chunks(path, chunked(pairs, 4), workers), fmt)
+        assert count == len(pairs)
+        outputs.append(out.getvalue())
+    assert outputs[0] == outputs[1]
+
+    if fmt == "csv":
+        rows = list(csv.DictReader(io.StringIO(outputs[0])))
+    else:
+        rows = [json.loads(line) for line in outputs[0].splitlines()]
+    assert [(r["start"], r["goal"]) for r in rows] == pairs
+    assert rows[-1]["error"] == "Вершина не найдена."
+    assert not rows[0].get("error")
+    for r in rows[:-1]:
+        s, t = g.vertex_id_by_name(r["start"]), g.vertex_id_by_name(r["goal"])
+        ref, _ = shortest_path(g, s, t)
+        dist = r["dist"] if fmt == "jsonl" else (float(r["dist"]) if r["dist"] else None)
+        assert (dist is None) == (ref == float("inf"))
+        if dist is not None:
+            assert dist == pytest.approx(ref)
@@ -0,0 +1,107 @@
+# test_connectivity.py
+import random
+
+import pytest
+
+from dijkstra import shortest_path, shortest_path_tree
+from graph_model import ConnectivityIndex, Graph
+
+
+def _reachable(g, u):
+    return set(shortest_path_tree(g.adj, u).dist)
+
+
+@pytest.mark.parametrize("undirected", [True, False])
+def test_index_is_sound_under_random_edits(make_graph, undirected):
+    rng = random.Random(5)
+    g = make_graph(40, 30, 1, undirected)
+    index = g.connectivity
+    index.rebuild()
+    for step in range(300):
+        vids = list(g.vertices)
+        op = rng.randrange(8)
+        if op < 4:
+            g.add_edge(rng.choice(vids), rng.choice(vids), 1.0)
+        elif op == 4:
+            g.add_edges_from([(rng.choice(vids), rng.choice(vids), 2.0) for _ in range(3)])
+        elif op == 5:
+            g.add_vertex()
+        elif op == 6:
+            u = rng.choice(vids)
+            if g.adj[u]:
+                g.remove_edge(u, rng.choice(list(g.adj[u])))
+        elif len(vids) > 10:
+            g.remove_vertex(rng.choice(vids))
+        if step % 50 == 49:
+            index.rebuild()
+            assert not index.stale
+        vids = list(g.vertices)
+        for _ in range(10):
+            a, b = rng.choice(vids), rng.choice(vids)
+            reach = b in _reachable(g, a)
+            if index.known_unreachable(a, b):
+                assert not reach
+            elif undirected and not index.stale:
+                assert reach
+            d, path = shortest_path(g, a, b, "astar")
+            assert (path is not None) == reach
+
+
+def test_rebuild_is_exact_for_directed_graphs(make_graph):
+    g = make_graph(50, 80, 2, undirected=False)
+    g.connectivity.rebuild()
+    for a in g.vertices:
+        reach = _reachable(g, a)
+        for b in g.vertices:
+            if b not in reach:
+                continue
+            assert not g.connectivity.known_unreachable(a, b)
+
+
+def test_queries_never_rebuild(make_graph, monkeypatch):
+    g = make_graph(30, 40, 3, undirected=False)
+    g.connectivity.rebuild()
+    u = next(iter(g.vertices))
+    g.remove_edge(u, next(iter(g.adj[u]))) if g.adj[u] else g.remove_vertex(u)
+    monkeypatch.setattr(ConnectivityIndex, "rebuild", lambda self: pytest.fail("rebuild"))
+    assert g.connectivity.stale
+    for v in list(g.vertices)[:5]:
+        for method in ("dijkstra", "bidirectional", "astar"):
+            shortest_path(g, u if u in g.vertices else v, v, method)
+
+
+def test_start_equals_goal():
+    g = Graph(undirected=False)
+    a = g.add_vertex("a")
+    g.connectivity.rebuild()
+    for method in ("dijkstra", "bidirectional", "astar"):
+        assert shortest_path(g, a, a, method) == (0.0, [a])
+
+
+def test_adopt_snapshot_index(make_graph):
+    g = make_graph(30, 40, 4, undirected=True)
+    snap = g.snapshot()
+    index = ConnectivityIndex(snap)
+    index.rebuild()
+    g.connectivity.adopt(index)
+    assert not g.connectivity.stale
+    for a in g.vertices:
+        reach = _reachable(g, a)
+        for b in g.vertices:
+            assert g.connectivity.known_unreachable(a, b) == (b not in reach)
+
+
+def test_snapshot_keeps_index_of_its_version(make_graph):
+    g = make_graph(30, 25, 6, undirected=True)
+    assert not g.snapshot().connectivity.built
+    g.connectivity.rebuild()
+    snap = g.publish()
+    assert snap.connectivity.built and snap.connectivity is not g.connectivity
+    for u in list(g.vertices):
+        for v in list(g.adj[u]):
+            g.remove_edge(u, v)
+    g.connectivity.rebuild()
+    for a in snap.vertices:
+        reach = _reachable(snap, a)
+        for b in snap.vertices:
+            assert snap.connectivity.known_unreachable(a, b) == (b not in reach)
@@ -0,0 +1,23 @@
+# test_contraction.py
+import pytest
+
+from contraction import ContractionHierarchy
+from dijkstra import shortest_path_tree
+
+
+@pytest.mark.parametrize("undirected", [True, False])
+def test_ch_matches_dijkstra(make_graph, undirected):
+    for seed in range(3):
+        g = make_graph(70, 180, seed, undirected, zero_share=0.1)
+        ch = ContractionHierarchy.build(g)
+        vids = list(g.vertices)
+        for s in vids[::6]:
+            tree = shortest_path_tree(g.adj, s)
+            for t in vids[::5]:
+                d, path = ch.query(s, t)
+                if t not in tree:
+                    assert path is None
+                    continue
+                assert d == pytest.approx(tree.distance(t))
+                assert path[0] == s and path[-1] == t
+                assert sum(g.adj[u][v] for u, v in zip(path, path[1:])) == pytest.approx(d)
@@ -0,0 +1,20 @@
+# test_csr.py
+import pytest
+
+from csr_graph import CSRGraph
+from dijkstra import dijkstra_csr, shortest_path_tree
+
+
+@pytest.mark.parametrize("undirected", [True, False])
+def test_csr_roundtrip_and_search(make_graph, undirected):
+    g = make_graph(60, 150, 4, undirected, zero_share=0.1)
+    csr = CSRGraph.from_graph(g)
+    assert csr.to_adj() == g.adj
+    assert csr.num_edges == sum(len(n) for n in g.adj.values())
+    vids = list(g.vertices)
+    for s in vids[::8]:
+        tree = shortest_path_tree(g.adj, s)
+        for t in vids[::5]:
+            d, path = dijkstra_csr(csr, s, t)
+            assert d == pytest.approx(tree.distance(t))
+            assert (path is None) == (t not in tree)
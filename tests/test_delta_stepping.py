@@ -0,0 +1,51 @@
+# test_delta_stepping.py
+import os
+
+import pytest
+from multiprocessing.shared_memory import SharedMemory
+
+import delta_stepping
+from csr_graph import CSRGraph
+from delta_stepping import DeltaStepping
+from dijkstra import shortest_path_tree
+
+
+def _boom(us, delta, light):
+    raise RuntimeError("сбой рабочего процесса")
+
+
+@pytest.mark.parametrize("undirected", [True, False])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_matches_dijkstra(make_graph, monkeypatch, undirected, workers):
+    monkeypatch.setattr(delta_stepping, "PARALLEL_MIN_FRONTIER", 4)
+    g = make_graph(120, 400, 11, undirected, zero_share=0.1)
+    with DeltaStepping(g, workers=workers) as engine:
+        for s in list(g.vertices)[::17]:
+            ref = shortest_path_tree(g.adj, s)
+            tree = engine.sssp(s)
+            assert tree.dist == ref.dist
+            for v in ref.dist:
+                assert tree.path_to(v) is not None
+
+
+def test_fallback_and_csr_input(make_graph):
+    g = make_graph(50, 120, 12, undirected=False)
+    s = next(iter(g.vertices))
+    ref = shortest_path_tree(g.adj, s).dist
+    assert delta_stepping.delta_stepping(g, s, workers=1).dist == ref
+    assert delta_stepping.delta_stepping(CSRGraph.from_graph(g), s, workers=1).dist == ref
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="нет /dev/shm")
+def test_segments_unlinked_when_worker_raises(make_graph, monkeypatch):
+    monkeypatch.setattr(delta_stepping, "PARALLEL_MIN_FRONTIER", 1)
+    monkeypatch.setattr(delta_stepping, "_relax_in_worker", _boom)
+    g = make_graph(60, 200, 13)
+    engine = DeltaStepping(g, workers=2)
+    names = [shm.name for shm in engine._shm]
+    with pytest.raises(RuntimeError):
+        with engine:
+            engine.sssp(next(iter(g.vertices)))
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name)
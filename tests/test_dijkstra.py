@@ -0,0 +1,59 @@
+# test_dijkstra.py
+import heapq
+
+import pytest
+
+from dijkstra import (METHODS, bidirectional_dijkstra, dijkstra, profile_path,
+                      shortest_path, shortest_path_tree)
+
+
+def _reference(adj, s):
+    dist = {s: 0.0}
+    pq = [(0.0, s)]
+    done = set()
+    while pq:
+        d, u = heapq.heappop(pq)
+        if u in done:
+            continue
+        done.add(u)
+        for v, w in adj.get(u, {}).items():
+            if d + w < dist.get(v, float("inf")):
+                dist[v] = d + w
+                heapq.heappush(pq, (d + w, v))
+    return dist
+
+
+def _path_length(adj, path):
+    return sum(adj[u][v] for u, v in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize("undirected", [True, False])
+def test_all_engines_match_reference(make_graph, undirected):
+    for seed in range(3):
+        g = make_graph(80, 220, seed, undirected, zero_share=0.1)
+        vids = list(g.vertices)
+        for s in vids[::9]:
+            ref = _reference(g.adj, s)
+            assert shortest_path_tree(g.adj, s).dist == pytest.approx(ref)
+            for t in vids[::7]:
+                expect = ref.get(t)
+                results = [shortest_path(g, s, t, m) for m in METHODS]
+                results += [dijkstra(g.adj, s, t, q) for q in ("heap2", "heap4", "auto")]
+                results.append(bidirectional_dijkstra(g.adj, g.radj, s, t))
+                for d, path in results:
+                    if expect is None:
+                        assert path is None
+                    else:
+                        assert d == pytest.approx(expect)
+                        assert path[0] == s and path[-1] == t
+                        assert _path_length(g.adj, path) == pytest.approx(expect)
+
+
+def test_profile_path_returns_stats(make_graph):
+    g = make_graph(50, 150, 1)
+    s, t = list(g.vertices)[0], list(g.vertices)[-1]
+    for method in METHODS:
+        d, path, stats = profile_path(g, s, t, method)
+        assert (d, path) == shortest_path(g, s, t, method)
+        assert stats.settled > 0 and stats.pushes >= stats.settled
+        assert stats.total_time > 0 and "search" in stats.phases
@@ -0,0 +1,52 @@
+# test_dynamic_sssp.py
+import random
+
+import pytest
+
+from dijkstra import shortest_path_tree
+from dynamic_sssp import DynamicShortestPathTree
+
+
+def _check(tree, g):
+    ref = shortest_path_tree(g.adj, tree.source).dist if tree.source in g.vertices else {}
+    assert tree.dist == pytest.approx(ref)
+    for v, d in ref.items():
+        path = tree.path_to(v)
+        assert path[0] == tree.source and path[-1] == v
+        assert sum(g.adj[a][b] for a, b in zip(path, path[1:])) == pytest.approx(d)
+
+
+@pytest.mark.parametrize("undirected", [True, False])
+@pytest.mark.parametrize("zero_share", [0.0, 0.2])
+@pytest.mark.parametrize("seed", range(4))
+def test_repairs_match_recompute(make_graph, undirected, zero_share, seed):
+    rng = random.Random(seed)
+    g = make_graph(50, 120, seed, undirected, zero_share)
+    tree = DynamicShortestPathTree(g, next(iter(g.vertices)))
+    for _ in range(200):
+        vids = list(g.vertices)
+        op = rng.randrange(5)
+        u, v = rng.choice(vids), rng.choice(vids)
+        w = 0.0 if rng.random() < zero_share else float(rng.randrange(1, 10))
+        if op == 0 and u != v:
+            tree.add_edge(u, v, w)
+        elif op == 1 and g.has_edge(u, v):
+            tree.update_edge_weight(u, v, w)
+        elif op == 2 and g.has_edge(u, v):
+            tree.remove_edge(u, v)
+        elif op == 3 and u != tree.source and len(vids) > 10:
+            tree.remove_vertex(u)
+        else:
+            tree.add_vertex()
+        _check(tree, g)
+
+
+def test_external_edit_triggers_rebuild(make_graph):
+    g = make_graph(30, 60, 9)
+    tree = DynamicShortestPathTree(g, next(iter(g.vertices)))
+    u = next(v for v in g.vertices if g.adj[v])
+    g.remove_edge(u, next(iter(g.adj[u])))
+    assert tree.stale
+    tree.distance(u)
+    assert not tree.stale
+    _check(tree, g)
@@ -0,0 +1,65 @@
+# test_graph_io.py
+import pytest
+
+from dijkstra import dijkstra_csr, shortest_path
+from graph_io import _HEADER, MappedGraph, load_binary, save_binary
+
+
+def test_binary_roundtrip(tmp_path, make_graph):
+    for undirected in (True, False):
+        g = make_graph(40, 90, 7, undirected)
+        path = str(tmp_path / "g.djkb")
+        save_binary(path, g, {v: (v * 1.0, -v * 1.0) for v in g.vertices})
+        loaded, positions = load_binary(path)
+        assert loaded.undirected == undirected
+        assert loaded.adj == g.adj
+        assert positions[5] == (5.0, -5.0)
+        with MappedGraph(path) as mg:
+            for v in list(g.vertices)[:5]:
+                assert mg.vertex_id_by_name(g.vertices.name(v)) == v
+                for t in list(g.vertices)[::7]:
+                    d, path_ = dijkstra_csr(mg.csr, v, t)
+                    ref, _ = shortest_path(g, v, t)
+                    assert d == pytest.approx(ref)
+
+
+def test_close_with_live_csr_reference(tmp_path, make_graph):
+    path = str(tmp_path / "g.djkb")
+    save_binary(path, make_graph(10, 20), {})
+    mg = MappedGraph(path)
+    csr = mg.csr
+    mg.close()
+    with pytest.raises(ValueError):
+        csr.targets[0]
+
+
+@pytest.mark.parametrize("cut", [0, 3, 40, 100])
+def test_truncated_file(tmp_path, make_graph, cut):
+    path = tmp_path / "g.djkb"
+    save_binary(str(path), make_graph(10, 20), {})
+    path.write_bytes(path.read_bytes()[:cut])
+    with pytest.raises(ValueError):
+        MappedGraph(str(path))
+
+
+@pytest.mark.parametrize("section", ["weights", "names"])
+def test_truncated_tail_sections(tmp_path, make_graph, section):
+    path = tmp_path / "g.djkb"
+    g = make_graph(50, 90, 3)
+    save_binary(str(path), g, {})
+    data = path.read_bytes()
+    n = len(g.vertices)
+    m = sum(len(nbrs) for nbrs in g.adj.values())
+    names_start = _HEADER.size + 8 * (6 * n + 2 + 2 * m)
+    names_size = sum(len(g.vertices.name(v).encode("utf-8")) for v in g.vertices)
+    cut = names_start - 4 if section == "weights" else names_start + names_size - 1
+    path.write_bytes(data[:cut])
+    with pytest.raises(ValueError):
+        MappedGraph(str(path))
+
+
+def test_bad_magic(tmp_path):
+    path = tmp_path / "g.djkb"
+    path.write_bytes(b"XXXX" + b"\0" * 200)
+    with pytest.raises(ValueError):
+        MappedGraph(str(path))
@@ -0,0 +1,176 @@
+# test_graph_model.py
+import random
+
+import pytest
+
+from dijkstra import shortest_path
+from graph_model import Graph, VertexTable
+
+
+def _edges(seed, n, m):
+    rng = random.Random(seed)
+    return [(rng.randrange(1, n + 1), rng.randrange(1, n + 1), float(rng.randrange(1, 9)))
+            for _ in range(m)]
+
+
+def _expected(edges, undirected, policy):
+    adj = {}
+    for u, v, w in edges:
+        keys = [(u, v), (v, u)] if undirected else [(u, v)]
+        old = adj.get(keys[0])
+        if old is None:
+            new = w
+        elif policy == "last":
+            new = w
+        elif policy == "first":
+            new = old
+        elif policy == "min":
+            new = min(old, w)
+        else:
+            new = old + w
+        for key in keys:
+            adj[key] = new
+    return adj
+
+
+@pytest.mark.parametrize("undirected", [True, False])
+@pytest.mark.parametrize("policy", ["last", "first", "min", "sum"])
+def test_bulk_insert_policies(undirected, policy):
+    edges = _edges(1, 20, 200)
+    g = Graph(undirected)
+    for _ in range(20):
+        g.add_vertex()
+    g.add_edges_from(edges[:70], policy)
+    g.add_edges_from(edges[70:], policy)
+    expect = _expected(edges, undirected, policy)
+    got = {(u, v): w for u, nbrs in g.adj.items() for v, w in nbrs.items()}
+    assert got == expect
+    rgot = {(u, v): w for v, nbrs in g.radj.items() for u, w in nbrs.items()}
+    assert rgot == expect
+
+
+def test_bulk_matches_single_inserts():
+    edges = _edges(2, 30, 300)
+    bulk = Graph.from_arrays(*zip(*edges), undirected=False)
+    single = Graph(False)
+    for vid in sorted(bulk.vertices):
+        single.add_vertex_explicit(vid, str(vid))
+    for u, v, w in edges:
+        single.add_edge(u, v, w)
+    assert bulk.adj == single.adj and bulk.radj == single.radj
+
+
+def test_unknown_policy_and_vertex():
+    g = Graph()
+    a = g.add_vertex()
+    with pytest.raises(ValueError):
+        g.add_edges_from([(a, a, 1.0)], "max")
+    with pytest.raises(ValueError):
+        g.add_edges_from([(a, 99, 1.0)])
+
+
+@pytest.mark.parametrize("undirected", [True, False])
+def test_snapshots_are_isolated(undirected):
+    rng = random.Random(3)
+    g = Graph(undirected)
+    vids = [g.add_vertex() for _ in range(30)]
+    for u, v, w in _edges(4, 30, 60):
+        g.add_edge(u, v, w)
+    taken = []
+    for step in range(150):
+        snap = g.publish()
+        assert g.publish() is snap and g.published is snap
+        taken.append((snap, {u: dict(n) for u, n in g.adj.items()},
+                      {u: dict(n) for u, n in g.radj.items()}, dict(g.vertices.items())))
+        vids = list(g.vertices)
+        op = rng.randrange(6)
+        u, v = rng.choice(vids), rng.choice(vids)
+        if op == 0:
+            g.add_edge(u, v, rng.random())
+        elif op == 1 and g.has_edge(u, v):
+            g.update_edge_weight(u, v, 42.0)
+        elif op == 2 and g.has_edge(u, v):
+            g.remove_edge(u, v)
+        elif op == 3 and len(vids) > 5:
+            g.remove_vertex(u)
+        elif op == 4:
+            g.add_edges_from([(rng.choice(vids), rng.choice(vids), 1.0) for _ in range(5)],
+                             rng.choice(["last", "first", "min", "sum"]))
+        else:
+            g.add_vertex()
+    for snap, adj, radj, vertices in taken:
+        assert snap.adj == adj and snap.radj == radj
+        assert dict(snap.vertices.items()) == vertices
+
+
+def test_snapshot_runs_searches_and_shares_rows():
+    g = Graph()
+    a, b, c = (g.add_vertex(x) for x in "abc")
+    g.add_edge(a, b, 1.0)
+    g.add_edge(b, c, 1.0)
+    snap = g.snapshot()
+    assert g.published is None
+    assert snap.adj[c] is g.adj[c]
+    g.add_edge(a, c, 0.5)
+    assert snap.adj[c] is not g.adj[c] and a not in snap.adj[c]
+    assert snap.vertex_id_by_name("c") == c and snap.has_edge(b, c)
+    assert shortest_path(snap, a, c) == (2.0, [a, b, c])
+    assert shortest_path(g, a, c) == (0.5, [a, c])
+
+
+
+def test_vertex_table_matches_dict():
+    rng = random.Random(5)
+    table, ref = VertexTable(), {}
+    for step in range(3000):
+        if ref and rng.random() < 0.3:
+            vid = rng.choice(list(ref))
+            del table[vid]
+            del ref[vid]
+        else:
+            vid = rng.randrange(1, 400) if step < 2000 else rng.choice([rng.randrange(400), 10 ** 9 + step])
+            table.set(vid, f"n{step}")
+            ref[vid] = f"n{step}"
+        assert len(table) == len(ref)
+    assert sorted(table) == sorted(ref)
+    assert {vid: v.name for vid, v in table.items()} == ref
+    assert all(vid in table and table.name(vid) == name for vid, name in ref.items())
+    assert -1 not in table and 10 ** 12 not in table and "x" not in table
+    with pytest.raises(KeyError):
+        table.name(10 ** 12)
+    copy = table.copy()
+    copy.clear()
+    assert len(table) == len(ref) and len(copy) == 0
+
+
+@pytest.mark.parametrize("undirected", [True, False])
+def test_remove_vertices_matches_scan(undirected):
+    rng = random.Random(8)
+    g = Graph(undirected)
+    for _ in range(40):
+        g.add_vertex()
+    for u, v, w in _edges(9, 40, 120) + [(3, 3, 1.0), (4, 4, 2.0), (3, 4, 1.0), (4, 5, 1.0)]:
+        g.add_edge(u, v, w)
+    for v in g.vertices:
+        preds = sorted(u for u in g.adj if v in g.adj[u])
+        assert sorted(g.predecessors(v)) == preds and g.in_degree(v) == len(preds)
+    doomed = [3, 4, 5] + rng.sample(range(6, 41), 8)
+    arcs = [(u, v) for u, nbrs in g.adj.items() for v in nbrs if u in doomed or v in doomed]
+    if undirected:
+        expected = {frozenset(a) for a in arcs}
+        key = frozenset
+    else:
+        expected = set(arcs)
+        key = tuple
+    adj = {u: {v: w for v, w in nbrs.items() if v not in doomed}
+           for u, nbrs in g.adj.items() if u not in doomed}
+    removed = g.remove_vertices(doomed + [3, 999])
+    assert len(removed) == len(expected) and {key(a) for a in removed} == expected
+    assert g.adj == adj
+    radj = {}
+    for u, nbrs in adj.items():
+        for v, w in nbrs.items():
+            radj.setdefault(v, {})[u] = w
+    assert {v: nbrs for v, nbrs in g.radj.items() if nbrs} == radj
+    assert not set(doomed) & set(g.radj)
+    assert all(v not in g.vertices and g.vertex_id_by_name(f"V{v}") is None for v in doomed)
@@ -0,0 +1,27 @@
+# test_heuristics.py
+import pytest
+
+from dijkstra import astar, shortest_path_tree
+from generators import grid_graph, random_geometric_graph
+from heuristics import check_geometric_weights, positional_heuristic
+
+
+def test_astar_euclidean_matches_dijkstra():
+    g, positions = random_geometric_graph(200, 120.0, seed=3)
+    assert check_geometric_weights(g.adj, positions) == []
+    h = positional_heuristic(positions)
+    vids = list(g.vertices)
+    for s in vids[::25]:
+        tree = shortest_path_tree(g.adj, s)
+        for t in vids[::17]:
+            d, path = astar(g.adj, s, t, h)
+            assert d == pytest.approx(tree.distance(t))
+            if path is not None:
+                assert path[0] == s and path[-1] == t
+                assert sum(g.adj[a][b] for a, b in zip(path, path[1:])) == pytest.approx(d)
+
+
+def test_inadmissible_scale_is_reported():
+    g, positions = grid_graph(5, 5, seed=1)
+    assert check_geometric_weights(g.adj, positions, "manhattan", scale=1.0)
+    assert check_geometric_weights(g.adj, positions, "manhattan", scale=0.025) == []
@@ -0,0 +1,47 @@
+# test_importers.py
+import io
+import json
+
+import pytest
+
+from graph_io import JSON_FORMAT, graph_from_dict, graph_to_dict
+from importers import import_dimacs, import_edge_list, import_tk_v1
+
+
+def _doc(edges_first: bool) -> dict:
+    vertices = [{"vid": i, "name": f"n{i}", "x": i, "y": -i} for i in range(1, 6)]
+    edges = [{"u": 1, "v": 2, "w": 5}, {"u": 2, "v": 3, "w": 1}, {"u": 2, "v": 1, "w": 9},
+             {"u": 1, "v": 2, "w": 3}, {"u": 4, "v": 5, "w": 2}, {"u": 3, "v": 2, "w": 0.5}]
+    items = [("edges", edges), ("vertices", vertices)] if edges_first else [("vertices", vertices), ("edges", edges)]
+    return dict([("format", JSON_FORMAT)] + items + [("undirected", True)])
+
+
+@pytest.mark.parametrize("edges_first", [False, True])
+@pytest.mark.parametrize("batch_size", [1, 2, 1000])
+def test_streaming_json_matches_graph_from_dict(edges_first, batch_size):
+    doc = _doc(edges_first)
+    ref, ref_pos = graph_from_dict(doc)
+    graph, positions = import_tk_v1(io.StringIO(json.dumps(doc)), batch_size)
+    assert graph.adj == ref.adj
+    assert positions == ref_pos
+    assert graph.adj[1][2] == 5.0
+
+
+def test_json_roundtrip(make_graph):
+    g = make_graph(30, 60, 9)
+    text = json.dumps(graph_to_dict(g, {}))
+    graph, _ = import_tk_v1(io.StringIO(text), batch_size=7)
+    assert graph.adj == g.adj
+
+
+def test_bad_format():
+    with pytest.raises(ValueError):
+        import_tk_v1(io.StringIO('{"format": "other", "vertices": [], "edges": []}'))
+
+
+def test_edge_list_and_dimacs():
+    g = import_edge_list(io.StringIO("# c\nsrc dst weight\na b 2\nb c 1.5\n"))
+    a, c = g.vertex_id_by_name("a"), g.vertex_id_by_name("c")
+    assert g.adj[g.vertex_id_by_name("b")] == {a: 2.0, c: 1.5}
+    d = import_dimacs(io.StringIO("c x\np sp 3 2\na 1 2 4\na 2 3 5\n"))
+    assert not d.undirected and d.adj == {1: {2: 4.0}, 2: {3: 5.0}, 3: {}}
@@ -0,0 +1,18 @@
+# test_matrix.py
+import pytest
+
+from dijkstra import shortest_path_tree
+from matrix import distance_matrix
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_distance_matrix_matches_trees(make_graph, workers):
+    g = make_graph(50, 110, 5, undirected=False)
+    vids = list(g.vertices)
+    sources, targets = vids[::4], vids[::3]
+    m = distance_matrix(g, sources, targets, workers=workers)
+    assert m.shape == (len(sources), len(targets))
+    for s in sources:
+        tree = shortest_path_tree(g.adj, s)
+        assert m.row(s) == pytest.approx([tree.distance(t) for t in targets])
+        assert m[s, targets[0]] == pytest.approx(tree.distance(targets[0]))
@@ -0,0 +1,68 @@
+# test_pqueue.py
+import random
+
+import pytest
+
+from dijkstra import dijkstra, shortest_path
+from graph_model import Graph
+from pqueue import BucketQueue, IndexedHeap, LazyHeap, RadixHeap, make_queue
+
+
+@pytest.mark.parametrize("factory", [lambda: IndexedHeap(2), lambda: IndexedHeap(4),
+                                     RadixHeap, lambda: BucketQueue(20)])
+def test_queue_matches_reference(factory):
+    for seed in range(3):
+        q = factory()
+        best = {}
+        last = 0
+        rng = random.Random(seed)
+        for _ in range(3000):
+            if best and rng.random() < 0.4:
+                key, item = q.pop()
+                assert key == min(best.values()) and best.pop(item) == key
+                assert key >= last
+                last = key
+            else:
+                item = rng.randrange(300)
+                key = last + rng.randrange(0, 20)
+                q.decrease_key(key, item)
+                best[item] = min(key, best.get(item, key))
+            assert len(q) == len(best)
+
+
+def _integer_graph(seed, undirected, max_w):
+    rng = random.Random(seed)
+    g = Graph(undirected)
+    vids = [g.add_vertex() for _ in range(80)]
+    for _ in range(250):
+        g.add_edge(rng.choice(vids), rng.choice(vids), float(rng.randrange(0, max_w + 1)))
+    return g
+
+
+@pytest.mark.parametrize("undirected", [True, False])
+@pytest.mark.parametrize("max_w", [7, 5000])
+def test_dijkstra_with_every_queue(undirected, max_w):
+    g = _integer_graph(max_w, undirected, max_w)
+    vids = list(g.vertices)
+    for s in vids[::11]:
+        for t in vids[::7]:
+            ref = dijkstra(g.adj, s, t)
+            for name in ("heap2", "heap4", "radix", "dial", "auto"):
+                d, path = dijkstra(g.adj, s, t, name)
+                assert d == ref[0]
+                assert (path is None) == (ref[1] is None)
+
+
+def test_auto_queue_and_cached_weight_stats(monkeypatch):
+    g = _integer_graph(1, True, 7)
+    assert isinstance(make_queue("auto", g.adj), LazyHeap)
+    assert g.weight_stats() == (True, 7.0)
+    monkeypatch.setattr("graph_model.weight_stats", lambda adj: pytest.fail("повторный проход"))
+    assert g.weight_stats() == (True, 7.0)
+    monkeypatch.undo()
+    g.add_edge(1, 2, 0.5)
+    assert g.weight_stats() == (False, 7.0)
+    with pytest.raises(ValueError):
+        make_queue("radix", g.adj, g.weight_stats())
+    with pytest.raises(ValueError):
+        shortest_path(g, 1, 2, queue="dial")
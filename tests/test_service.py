@@ -0,0 +1,103 @@
+# test_service.py
+import asyncio
+import json
+
+import pytest
+
+from service import QueryService, _handle_connection
+
+
+@pytest.fixture
+def service(tmp_path):
+    path = tmp_path / "g.txt"
+    path.write_text("a b 1\nb c 2\na c 5\nx y 1\n", encoding="utf-8")
+    svc = QueryService(str(path))
+    yield svc
+    svc.close()
+
+
+def _handle(svc, method, path, body):
+    return asyncio.run(svc.handle(method, path, body))
+
+
+def test_query_and_batch(service):
+    status, result = _handle(service, "POST", "/query", b'{"start": "a", "goal": "c"}')
+    assert status == 200 and result == {"dist": 3.0, "path": ["a", "b", "c"]}
+    status, result = _handle(service, "POST", "/batch", b'{"queries": [["a", "c"], ["a", "y"]]}')
+    assert status == 200
+    assert result["results"] == [{"dist": 3.0, "path": ["a", "b", "c"]}, {"dist": None, "path": None}]
+    status, _ = _handle(service, "POST", "/query", b'{"start": "a", "goal": "zzz"}')
+    assert status == 404
+
+
+@pytest.mark.parametrize("body", [
+    b"[1, 2]", b'"a"', b"not json", b"\xff",
+    b'{"start": []}', b'{"start": [], "goal": "a"}', b'{"start": "a", "goal": {}}',
+    b'{"start": true, "goal": "a"}',
+])
+def test_query_rejects_bad_shapes(service, body):
+    status, result = _handle(service, "POST", "/query", body)
+    assert status == 400 and "error" in result
+
+
+@pytest.mark.parametrize("body", [
+    b'{"queries": [1]}', b'{"queries": "ab"}', b'{"queries": [["a"]]}',
+    b'{"queries": [["a", "b", "c"]]}', b'{"queries": [[["a"], "b"]]}', b'{"queries": {"a": "b"}}',
+])
+def test_batch_rejects_bad_shapes(service, body):
+    status, result = _handle(service, "POST", "/batch", body)
+    assert status == 400 and "error" in result
+
+
+def _roundtrip(svc, raw: bytes) -> bytes:
+    async def run():
+        server = await asyncio.start_server(
+            lambda r, w: _handle_connection(svc, r, w), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            data = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            return data
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_bad_content_length_gets_400(service, length):
+    raw = _roundtrip(service, b"POST /query HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n")
+    head, _, body = raw.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 400")
+    assert "error" in json.loads(body)
+
+
+def test_bad_body_over_socket_gets_400(service):
+    body = b'{"queries": [1]}'
+    raw = _roundtrip(service, b"POST /batch HTTP/1.1\r\nConnection: close\r\nContent-Length: "
+                     + str(len(body)).encode() + b"\r\n\r\n" + body)
+    assert raw.startswith(b"HTTP/1.1 400")
+
+
+def test_handler_error_gets_500(service, monkeypatch):
+    async def broken(method, path, body):
+        raise RuntimeError("сбой")
+
+    monkeypatch.setattr(service, "handle", broken)
+    raw = _roundtrip(service, b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+    head, _, body = raw.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 500")
+    assert "сбой" in json.loads(body)["error"]
+
+
+def test_batch_tasks_are_kept_until_done(service):
+    async def run():
+        pending = asyncio.gather(*(service.solve_one("a", goal) for goal in "bcy"))
+        await asyncio.sleep(0)
+        service._flush()
+        assert len(service._tasks) == 1
+        return await pending
+
+    results = asyncio.run(run())
+    assert [r["dist"] for r in results] == [1.0, 3.0, None]
+    assert not service._tasks
@@ -0,0 +1,22 @@
+# test_stats.py
+from dijkstra import shortest_path_tree
+from graph_model import Graph
+from stats import SearchStats
+
+
+def test_progress_counts_relaxations():
+    g = Graph(undirected=False)
+    hubs = [g.add_vertex() for _ in range(4)]
+    for a, b in zip(hubs, hubs[1:]):
+        g.add_edge(a, b, 1.0)
+    for h in hubs:
+        for _ in range(2000):
+            g.add_edge(h, g.add_vertex(), 10.0)
+
+    events = []
+    stats = SearchStats(hook=lambda e, s: events.append(e) if e == "progress" else None,
+                        progress_every=1024)
+    tree = shortest_path_tree(g.adj, hubs[0], max_dist=5.0, stats=stats)
+    assert len(tree.dist) == 4
+    assert stats.settled == 4 and stats.relaxations == 3 * 2001 + 2000
+    assert events.count("progress") >= 3
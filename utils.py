@@ -10,3 +10,10 @@ COLORS = {
     "accent": "#0ea5e9",
     "select": "#22c55e",
 }
+
+ALGORITHMS = {
+    "Дейкстра": "dijkstra",
+    "Двунаправленный": "bidirectional",
+    "A* (евклид)": "astar",
+    "ALT (ориентиры)": "alt",
+}